@@ -1,14 +1,15 @@
 import eventlet
 eventlet.monkey_patch()
+import os
 import traceback
 from flask import Flask, request, jsonify
-from flask_migrate import Migrate
+from flask_migrate import Migrate, upgrade
 from flask_cors import CORS
 from flask_socketio import SocketIO, emit, join_room, leave_room
 from flask_jwt_extended import JWTManager
-from setup.extensions import db
+from setup.extensions import db, socketio
 from models import User, Friendship
-from models import User, Message, Chat, ChatParticipant
+from models import User, Message, Chat, ChatParticipant, Game, Player
 from auth import auth
 from games.word_chain import word_chain_bp
 from games.word_blitz import word_blitz_bp
@@ -18,8 +19,17 @@ from friends import friends_bp
 from setup.seed_data import seed_question_sets
 from profile_user import profile_bp
 import jwt
-from chat import chat_bp, get_active_chat_details, get_all_active_chat_details_as_array
+from jwt import PyJWTError  # `jwt` is rebound to the JWTManager below
+from chat import (
+    chat_bp, get_active_chat_details, record_message, message_created_event, active_chat_ids,
+    find_direct_chat_id, get_or_create_direct_chat
+)
 from utils.auth_utils import get_user_from_token
+from presence import init_presence, get_presence, user_room
+from games.game_events import game_room_name
+from games.answer_index import answer_index
+from games.game_clock import game_clock
+from games.question_catalog import question_catalog
 
 app = Flask(__name__)
 
@@ -33,13 +43,45 @@ app.config['JWT_TOKEN_LOCATION'] = ['headers']
 app.config['JWT_HEADER_NAME'] = 'Authorization'
 app.config['JWT_HEADER_TYPE'] = 'Bearer'
 
+# Answer checker backend: "ollama", "lexicon" or "fake" (see games/verifiers.py).
+# ANSWER_VERIFIERS_BY_GAME_TYPE overrides it per game type, e.g. {"WordBlitzLocal": "lexicon"}.
+app.config['ANSWER_VERIFIER'] = os.environ.get('ANSWER_VERIFIER', 'ollama')
+app.config['ANSWER_VERIFIERS_BY_GAME_TYPE'] = {}
+app.config['OLLAMA_MODEL'] = os.environ.get('OLLAMA_MODEL', 'llama3.2:1b')
+app.config['FAKE_VERIFIER_LATENCY'] = float(os.environ.get('FAKE_VERIFIER_LATENCY', 0))
+app.config['FAKE_VERIFIER_ERROR_RATE'] = float(os.environ.get('FAKE_VERIFIER_ERROR_RATE', 0))
+app.config['FAKE_VERIFIER_SEED'] = int(os.environ.get('FAKE_VERIFIER_SEED', 0))
+
+# Word chain dictionary file, unset means games/data/wordchain_words.dict.
+# Build it with: flask --app app word_chain build-dictionary /usr/share/dict/words
+app.config['WORD_CHAIN_DICTIONARY'] = os.environ.get('WORD_CHAIN_DICTIONARY')
+
+# Running more than one worker: point every worker at the same Redis-protocol
+# server, e.g. SOCKETIO_MESSAGE_QUEUE=redis://localhost:6379/0, so SocketIO
+# emits reach clients connected to any worker. Unset means in-process only.
+# PRESENCE_URL ("memory" or a redis:// url) defaults to the message queue.
+# Game caches stay per worker but check a version kept on the game row
+# (letter_match_states: Game.state_version, chain_states: Game.chain_seq) or
+# expire by age (question_catalog, answer_index, friend_lists), and time left
+# is worked out from the game row. The one thing that is not shared: a round
+# only ends on time on the worker that scheduled it; if that worker dies the
+# round ends when a worker next starts (game_clock.load_pending).
+# Check the Redis side against a local stand-in: python -m benchmarks.check_multi_worker
+app.config['SOCKETIO_MESSAGE_QUEUE'] = os.environ.get('SOCKETIO_MESSAGE_QUEUE')
+app.config['PRESENCE_URL'] = os.environ.get('PRESENCE_URL', app.config['SOCKETIO_MESSAGE_QUEUE'])
+# Seconds without a presence_ping before a connection counts as gone, and how
+# many users' last-seen times are kept (see presence.py)
+app.config['PRESENCE_IDLE_TIMEOUT'] = int(os.environ.get('PRESENCE_IDLE_TIMEOUT', 180))
+app.config['PRESENCE_MAX_USERS'] = int(os.environ.get('PRESENCE_MAX_USERS', 100000))
+
 CORS(app)
 
 # Initialize Extensions
 db.init_app(app)
-migrate = Migrate(app, db)
+migrate = Migrate(app, db, directory=os.path.join(os.path.dirname(os.path.abspath(__file__)), 'migrations'))
 jwt = JWTManager(app)
-socketio = SocketIO(app, cors_allowed_origins="*", async_mode="eventlet")
+socketio.init_app(app, cors_allowed_origins="*", async_mode="eventlet", message_queue=app.config['SOCKETIO_MESSAGE_QUEUE'])
+init_presence(app)
 
 # Register Blueprints
 app.register_blueprint(auth, url_prefix="/auth")
@@ -69,11 +111,56 @@ def get_jwt_token(request):
         return jsonify({"message": "Invalid or expired token!"}), 401
 
 with app.app_context():
+    # create_all only adds missing tables; the migrations add the columns
+    # newer models need to tables an older version of the app created
     db.create_all()
+    upgrade()
     seed_question_sets()
+    answer_index.load()
+    question_catalog.load()
+    game_clock.load_pending(app)
 
 # SocketIO Handlers
-username_to_sid = {} 
+
+@socketio.on('join_game')
+def join_game(data):
+    room = data.get('room')
+    if not room:
+        emit('error', {'message': 'Missing room'})
+        return
+
+    token = data.get('token')
+    if not token:
+        emit('error', {'message': 'Missing token'})
+        return
+
+    try:
+        user = get_user_from_token(token)
+    except PyJWTError:  # expired, forged or malformed
+        user = None
+    if not user:
+        emit('error', {'message': 'Invalid token'})
+        return
+
+    # Only players of the game get its events
+    is_player = (
+        db.session.query(Player.id)
+        .join(Game, Player.game_id == Game.id)
+        .filter(Game.room == room, Player.username == user.username)
+        .first()
+    )
+    if not is_player:
+        emit('error', {'message': 'You are not in this game'})
+        return
+
+    join_room(game_room_name(room))
+    emit('joined_game', {'room': room}, room=request.sid)
+
+@socketio.on('leave_game')
+def leave_game(data):
+    room = data.get('room')
+    if room:
+        leave_room(game_room_name(room))
 
 @socketio.on('create_chat')
 def create_chat(data):
@@ -97,39 +184,23 @@ def create_chat(data):
     sender_id = sender_user.id
     recipient_id = recipient_user.id
 
-    chats_with_sender = Chat.query.join(ChatParticipant).filter(ChatParticipant.user_id == sender_id).all()
-    chat = None
-    for c in chats_with_sender:
-        recipient_participant = ChatParticipant.query.filter_by(chat_id=c.id, user_id=recipient_id).first()
-        if recipient_participant:
-            chat = c
-            break
-
-    if not chat:
-        chat = Chat()
-        db.session.add(chat)
-        db.session.commit()
-        participant_1 = ChatParticipant(chat_id=chat.id, user_id=sender_id, chat_active=True)
-        participant_2 = ChatParticipant(chat_id=chat.id, user_id=recipient_id, chat_active=True)
+    chat_id, created = get_or_create_direct_chat(sender_id, recipient_id)
+    if created:
         print(f"Creating chat for sender: {sender_id}, recipient: {recipient_id}")
-        db.session.add(participant_1)
-        db.session.add(participant_2)
-        db.session.commit()
     else: 
-        sender_participant = ChatParticipant.query.filter_by(chat_id=chat.id, user_id=sender_id).first()
-        sender_participant.chat_active = True
+        ChatParticipant.query.filter_by(chat_id=chat_id, user_id=sender_id).update({ChatParticipant.chat_active: True})
         db.session.commit()
 
-    room_name = chat.id
+    room_name = chat_id
     join_room(room_name)
 
     emit('joined_room', {'room_name': room_name}, room=sender_id)
     emit('joined_room', {'room_name': room_name}, room=recipient_id)
 
-    chat_details = get_all_active_chat_details_as_array(sender_user.id)
-    new_chat_details = get_active_chat_details(chat.id, sender_user.id)
+    # Only the new chat, the sender merges it into their inbox
+    new_chat_details = get_active_chat_details(chat_id, sender_user.id)
 
-    emit('chat_created', {'chat_details': chat_details, 'new_chat': new_chat_details}, room=room_name)
+    emit('chat_created', {'new_chat': new_chat_details}, room=request.sid)
 
 @socketio.on('create_message')
 def create_message(data):
@@ -148,35 +219,18 @@ def create_message(data):
 
     recipient_user = User.query.filter_by(username=recipient_username).first()
 
-    chats_with_sender = Chat.query.join(ChatParticipant).filter(ChatParticipant.user_id == sender_user.id).all()
-    chat = None
-    for c in chats_with_sender:
-        recipient_participant = ChatParticipant.query.filter_by(chat_id=c.id, user_id=recipient_user.id).first()
-        if recipient_participant:
-            recipient_participant.chat_active = True
-            chat = c
-            break
+    chat_id = find_direct_chat_id(sender_user.id, recipient_user.id) if recipient_user else None
+    if chat_id is None:
+        emit('error', {'message': 'Chat not found'})
+        return
 
-    db.session.add(Message(chat_id=chat.id, sender_id=sender_user.id, message_body=message_body, read=False))
+    sender_username = sender_user.username
+    message = record_message(chat_id, sender_user.id, message_body)
+    event = message_created_event(message, sender_username)
     db.session.commit()  
-    
-    all_chat_details = get_all_active_chat_details_as_array(sender_user.id)
-    new_chat_details = get_active_chat_details(chat.id, sender_user.id)
 
-    new_message_details = {
-        'message_body': message_body,
-        'username': sender_user.username
-    }
-
-    room_name = chat.id
-    recipient_sid = username_to_sid.get(recipient_username)
-
-    if recipient_sid:
-        join_room(room_name, sid=recipient_sid)
-
-    join_room(room_name, sid=request.sid)
-
-    emit('message_created',  {'all_chat_details': all_chat_details, 'new_chat_details': new_chat_details, 'new_message_details': new_message_details}, room=room_name)
+    # Every connection of both users, on whichever worker it is
+    emit('message_created', event, to=[user_room(sender_username), user_room(recipient_username)])
 
 @socketio.on('join_chat_rooms')
 def join_chat_rooms(data):
@@ -191,19 +245,25 @@ def join_chat_rooms(data):
         return
 
     username = user.username
-    sid = request.sid
-    username_to_sid[username] = sid
+    get_presence().add(username, request.sid)
+    join_room(user_room(username))
 
-    chat_details = get_all_active_chat_details_as_array(user.id)
-
-    room_ids = []
-    for chat in chat_details:
-        room_id = chat['chat_id'] 
+    room_ids = active_chat_ids(user.id)
+    for room_id in room_ids:
         join_room(room_id)
-        room_ids.append(room_id)
 
     emit('joined_chat_rooms', {'rooms': room_ids}, room=request.sid)
 
+@socketio.on('presence_ping')
+def presence_ping(data=None):
+    # An evicted connection has to identify itself again through join_chat_rooms
+    if not get_presence().touch(request.sid):
+        emit('presence_expired', {}, room=request.sid)
+
+@socketio.on('disconnect')
+def disconnect(reason=None):
+    get_presence().remove(request.sid)
+
 if __name__ == "__main__": 
     with app.app_context():
         db.create_all()
@@ -0,0 +1,70 @@
+"""
+Round-trips per /chat/get-chats call.
+
+Seeds one user with N direct-message chats of M messages each, then fetches
+the inbox a few times and reports the number of SQL statements and the
+latency per call.
+    cd backend && python -m benchmarks.bench_chat_inbox
+"""
+import statistics
+import warnings
+import jwt
+from benchmarks.bench_utils import make_bench_app, count_queries, timed
+from setup.extensions import db
+from models import User, Chat, ChatParticipant, Message
+
+SIZES = ((5, 20), (20, 20), (20, 100), (50, 100))
+CALLS = 5
+
+
+def seed(app, chats, messages):
+    with app.app_context():
+        owner = User(username=f"owner-{chats}x{messages}", email=f"owner-{chats}x{messages}", password="x")
+        db.session.add(owner)
+        db.session.flush()
+        for c in range(chats):
+            friend = User(username=f"friend-{chats}x{messages}-{c}", email=f"friend-{chats}x{messages}-{c}", password="x")
+            chat = Chat()
+            db.session.add_all([friend, chat])
+            db.session.flush()
+            db.session.add(ChatParticipant(chat_id=chat.id, user_id=owner.id, chat_active=True, unread_count=3))
+            db.session.add(ChatParticipant(chat_id=chat.id, user_id=friend.id, chat_active=True))
+            db.session.add_all([
+                Message(
+                    chat_id=chat.id,
+                    sender_id=owner.id if m % 2 else friend.id,
+                    message_body=f"message {m}",
+                    read=m < messages - 3
+                )
+                for m in range(messages)
+            ])
+        db.session.commit()
+        return jwt.encode({"user_id": owner.id}, app.config["SECRET_KEY"], algorithm="HS256")
+
+
+def run(app, chats, messages):
+    token = seed(app, chats, messages)
+    client = app.test_client()
+    headers = {"Authorization": f"Bearer {token}"}
+    counts, times, sizes = [], [], []
+    for _ in range(CALLS):
+        with count_queries(app) as counter:
+            resp, ms = timed(client.get, "/chat/get-chats", headers=headers)
+        assert resp.status_code == 200, resp.get_data(as_text=True)
+        counts.append(counter.count)
+        times.append(ms)
+        sizes.append(len(resp.get_data()))
+    return statistics.mean(counts), statistics.median(times), statistics.mean(sizes)
+
+
+def main():
+    warnings.filterwarnings("ignore", message="The HMAC key")  # the bench app's short SECRET_KEY
+    app = make_bench_app()
+    print(f"{'chats':>6}{'messages':>10}{'queries':>10}{'median ms':>12}{'bytes':>10}")
+    for chats, messages in SIZES:
+        queries, ms, size = run(app, chats, messages)
+        print(f"{chats:>6}{messages:>10}{queries:>10.1f}{ms:>12.2f}{size:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Round-trips per /letter_match/submit_all call.
+
+Seeds a LetterMatch game with N questions and a known answer list, then
+submits a full answer sheet for each player and reports the number of SQL
+statements and the latency per submission.
+    cd backend && python -m benchmarks.bench_letter_match_submit
+"""
+import statistics
+from benchmarks.bench_utils import make_bench_app, count_queries, timed
+from setup.extensions import db
+from models import Game, Player, question_LetterMatch, game_question_lettermatch, letterMatch_answers
+
+QUESTION_COUNTS = (5, 10, 20)
+PLAYERS = 4
+LETTER = "B"
+
+
+def seed(app, questions, game_type):
+    with app.app_context():
+        game = Game(room=f"bench-{game_type}-{questions}", game_type=game_type, time_limit=3600)
+        db.session.add(game)
+        db.session.flush()
+        for i in range(PLAYERS):
+            db.session.add(Player(username=f"player{i}", game_id=game.id, is_creator=(i == 0), score=0))
+        for i in range(questions):
+            q = question_LetterMatch(prompt=f"Category {i}")
+            db.session.add(q)
+            db.session.flush()
+            db.session.add(letterMatch_answers(category_id=q.id, answer=f"Banana{i}", letter=LETTER))
+            db.session.add(game_question_lettermatch(game_id=game.id, question_id=q.id, letter=LETTER))
+        game.started = True
+        from datetime import datetime
+        game.start_time = datetime.utcnow()
+        db.session.commit()
+        qids = [gq.question_id for gq in game_question_lettermatch.query.filter_by(game_id=game.id).all()]
+        return game.room, qids
+
+
+def run(app, questions, game_type):
+    room, qids = seed(app, questions, game_type)
+    client = app.test_client()
+    counts, times = [], []
+    for i in range(PLAYERS):
+        # Half right, half wrong, all with the right letter
+        answers = {str(qid): (f"Banana{n}" if n % 2 == 0 else "Bogus") for n, qid in enumerate(qids)}
+        payload = {"room": room, "username": f"player{i}", "answers": answers}
+        with count_queries(app) as counter:
+            resp, ms = timed(client.post, "/letter_match/submit_all", json=payload)
+        assert resp.status_code == 200, resp.get_json()
+        counts.append(counter.count)
+        times.append(ms)
+    return statistics.mean(counts), statistics.median(times)
+
+
+def main():
+    app = make_bench_app()
+    print(f"{'game type':<20}{'answers':>8}{'queries':>10}{'median ms':>12}")
+    for game_type in ("LetterMatchOnline", "LetterMatchLocal"):
+        for questions in QUESTION_COUNTS:
+            queries, ms = run(app, questions, game_type)
+            print(f"{game_type:<20}{questions:>8}{queries:>10.1f}{ms:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
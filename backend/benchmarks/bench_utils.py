@@ -0,0 +1,66 @@
+"""
+Helpers shared by the benchmark scripts in this folder.
+
+The benchmarks build their own Flask app on an in-memory SQLite database
+(no eventlet, no Ollama) so they can run anywhere:
+    cd backend && python -m benchmarks.bench_letter_match_submit
+"""
+import time
+from contextlib import contextmanager
+from flask import Flask
+from sqlalchemy import event
+from setup.extensions import db, socketio
+
+
+def make_bench_app(database_uri='sqlite://'):
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = database_uri
+    app.config['SECRET_KEY'] = 'bench'
+    app.config['ANSWER_VERIFIER'] = 'fake'
+    db.init_app(app)
+    socketio.init_app(app, async_mode="threading")
+
+    from games.word_chain import word_chain_bp
+    from games.word_blitz import word_blitz_bp
+    from games.answer_checker import answer_checker_bp
+    from games.letter_match import letter_match_bp
+    from chat import chat_bp
+    from friends import friends_bp
+    app.register_blueprint(word_chain_bp, url_prefix="/word_chain")
+    app.register_blueprint(word_blitz_bp, url_prefix="/word_blitz")
+    app.register_blueprint(answer_checker_bp, url_prefix="/answer_checker")
+    app.register_blueprint(letter_match_bp, url_prefix="/letter_match")
+    app.register_blueprint(chat_bp, url_prefix="/chat")
+    app.register_blueprint(friends_bp, url_prefix="/friends")
+
+    with app.app_context():
+        db.create_all()
+    return app
+
+
+class QueryCounter:
+    """Counts SQL statements sent to the database while active."""
+
+    def __init__(self):
+        self.count = 0
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany):
+        self.count += 1
+
+
+@contextmanager
+def count_queries(app):
+    counter = QueryCounter()
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, "before_cursor_execute", counter._on_execute)
+    try:
+        yield counter
+    finally:
+        event.remove(engine, "before_cursor_execute", counter._on_execute)
+
+
+def timed(func, *args, **kwargs):
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, (time.perf_counter() - start) * 1000
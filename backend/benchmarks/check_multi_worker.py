@@ -0,0 +1,134 @@
+"""
+Checks the multi-worker setup against a local stand-in for Redis (a
+fakeredis TCP server), no real Redis needed:
+  - two RedisPresence registries see each other's connections
+  - an emit published by one SocketIO server reaches another one's manager
+  - per-worker game caches notice changes committed by another worker
+    cd backend && python -m benchmarks.check_multi_worker
+Needs fakeredis (pip install fakeredis). Exits non-zero if a check fails.
+"""
+import socket
+import sys
+import threading
+import time
+import socketio
+from benchmarks.bench_utils import make_bench_app
+from setup.extensions import db
+from models import User, Game
+from presence import RedisPresence
+
+try:
+    from fakeredis import TcpFakeServer
+except ImportError:  # only needed by this script
+    TcpFakeServer = None
+
+failures = []
+
+
+def check(name, ok):
+    print(f"{'ok  ' if ok else 'FAIL'} {name}")
+    if not ok:
+        failures.append(name)
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def check_presence(url):
+    worker_1, worker_2 = RedisPresence(url, idle_timeout=60), RedisPresence(url, idle_timeout=60)
+    worker_1.add("alice", "sid-1")
+    worker_2.add("alice", "sid-2")
+    check("presence: a connection on worker 1 is online on worker 2", worker_2.is_online("alice"))
+    check("presence: both workers see both sids", worker_1.sids("alice") == {"sid-1", "sid-2"})
+
+    check("presence: worker 2 removes worker 1's sid on disconnect", worker_2.remove("sid-1") == "alice")
+    worker_1.remove("sid-2")
+    check("presence: offline once every sid is gone", not worker_1.is_online("alice"))
+    check("presence: last seen is shared", "alice" in worker_2.last_seen(["alice"]))
+
+    worker_1.add("bob", "sid-3")
+    check("presence: idle sids are evicted", worker_2.evict_idle(now=time.time() + 120) == 1)
+    check("presence: evicted user is offline", not worker_1.is_online("bob"))
+
+
+def check_fan_out(url):
+    received = []
+    manager_1, manager_2 = socketio.RedisManager(url), socketio.RedisManager(url)
+    server_1 = socketio.Server(client_manager=manager_1, async_mode="threading")
+    socketio.Server(client_manager=manager_2, async_mode="threading")
+    manager_2._handle_emit = lambda message: received.append((message["event"], message["room"]))
+    threading.Thread(target=manager_2._thread, daemon=True).start()
+    time.sleep(0.5)
+
+    server_1.emit("message_created", {"chat_id": 1}, to="user:alice")
+    deadline = time.time() + 3
+    while not received and time.time() < deadline:
+        time.sleep(0.05)
+    check("fan-out: an emit on worker 1 reaches worker 2", received == [("message_created", "user:alice")])
+
+
+def check_game_caches():
+    from games.state_cache import GameStateCache
+    from games.chain_state import ChainStates
+    import games.letter_match as letter_match
+    import games.word_chain as word_chain
+
+    app = make_bench_app()
+    client = app.test_client()
+    with app.app_context():
+        db.session.add(User(username="admin", email="admin", password="x", role=0))
+        db.session.commit()
+
+    # Letter Match: worker 2 caches the state, worker 1 changes it
+    client.post("/letter_match/create", json={"room": "lm", "game_type": "LetterMatchOnline", "creator_username": "a"})
+    worker_1_states, worker_2_states = letter_match.letter_match_states, GameStateCache()
+    letter_match.letter_match_states = worker_2_states
+    client.get("/letter_match/get_state?room=lm")
+    letter_match.letter_match_states = worker_1_states
+    client.post("/letter_match/join", json={"room": "lm", "username": "b"})
+    letter_match.letter_match_states = worker_2_states
+    players = [p["username"] for p in client.get("/letter_match/get_state?room=lm").get_json()["players"]]
+    letter_match.letter_match_states = worker_1_states
+    check("letter match: worker 2 sees a player who joined on worker 1", players == ["a", "b"])
+
+    # Word Chain: worker 2 caches the chain, worker 1 vetoes a word
+    client.post("/word_chain/create", json={"room": "wc"})
+    client.post("/word_chain/join", json={"room": "wc", "username": "a"})
+    for word in ("apple", "egg", "goat"):
+        client.post("/word_chain/submit_word", json={"room": "wc", "username": "a", "word": word})
+    worker_1_chains, worker_2_chains = word_chain.chain_states, ChainStates()
+    with app.app_context():
+        worker_2_chains.get(Game.query.filter_by(room="wc").first())
+    client.post("/word_chain/veto_word", json={"room": "wc", "admin_username": "admin", "word": "goat"})
+    word_chain.chain_states = worker_2_chains
+    reply = client.post("/word_chain/submit_word", json={"room": "wc", "username": "a", "word": "goat"})
+    word_chain.chain_states = worker_1_chains
+    check("word chain: a word vetoed on worker 1 can be played again on worker 2", reply.status_code == 200)
+
+
+def main():
+    if TcpFakeServer is None:
+        print("fakeredis is not installed: pip install fakeredis")
+        return 2
+
+    port = free_port()
+    server = TcpFakeServer(("127.0.0.1", port), server_type="redis")
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"redis://127.0.0.1:{port}/0"
+    try:
+        check_presence(url)
+        check_fan_out(url)
+        check_game_caches()
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    print(f"{len(failures)} check(s) failed" if failures else "All checks passed")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,16 +1,25 @@
 import traceback
 from flask import Blueprint, request, jsonify
+from sqlalchemy import func
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from setup.extensions import db
 from models import User, Message, Chat, ChatParticipant
 from utils.auth_utils import get_user_from_req
+from utils.lru import LRUCache
 
 chat_bp = Blueprint('chat', __name__)
 
+# Default and largest page size for /chat/messages
+MESSAGES_PAGE_SIZE = 50
+MAX_MESSAGES_PAGE_SIZE = 200
+DEFAULT_MAX_DIRECT_CHATS = 10000
+
 
 @chat_bp.route("/get-chats", methods=["GET"])
 def get_chats():
     """
-    Right now only up to 99 messages from each chat are returned.
+    Inbox: every active chat with its last message and unread count.
+    Message history is paged through /chat/messages.
     """
     user = get_user_from_req(request)
     user_id = user.id
@@ -21,41 +30,254 @@ def get_chats():
 
 
 def get_all_active_chat_details_as_array(end_user_id):
-    chat_activity = ChatParticipant.query.filter((ChatParticipant.user_id == end_user_id) & (ChatParticipant.chat_active == True)).all()
+    participants = (
+        ChatParticipant.query
+        .filter(ChatParticipant.user_id == end_user_id, ChatParticipant.chat_active == True)
+        .order_by(ChatParticipant.id)
+        .all()
+    )
+    return chat_summaries(participants, end_user_id)
+
+
+def get_active_chat_details(chat_id, end_user_id):
+    participants = ChatParticipant.query.filter_by(chat_id=chat_id, user_id=end_user_id).all()
+    return chat_summaries(participants, end_user_id)[0]
 
-    chat_details = []
 
-    for activity in chat_activity:
-        chat_id = activity.chat_id
-        chat_details.append(get_active_chat_details(chat_id, end_user_id))
-    return chat_details
+def chat_summaries(participants, end_user_id):
+    """
+    Inbox summaries for the end user's ChatParticipant rows: the other
+    participant, the last message and the unread count (kept on the
+    participant row, see record_message). A fixed number of queries however
+    many chats and messages there are; the history itself is paged through
+    /chat/messages.
+    """
+    if not participants:
+        return []
+    chat_ids = [p.chat_id for p in participants]
 
+    others = {
+        chat_id: (username, last_read)
+        for chat_id, username, last_read in db.session.query(
+            ChatParticipant.chat_id, User.username, ChatParticipant.last_read_message_id
+        )
+        .join(User, User.id == ChatParticipant.user_id)
+        .filter(ChatParticipant.chat_id.in_(chat_ids), ChatParticipant.user_id != end_user_id)
+        .all()
+    }
 
+    last_ids = (
+        db.session.query(func.max(Message.id).label("message_id"))
+        .filter(Message.chat_id.in_(chat_ids))
+        .group_by(Message.chat_id)
+        .subquery()
+    )
+    own_last_read = {p.chat_id: p.last_read_message_id for p in participants}
+    last_messages = {}
+    for row in message_query().join(last_ids, last_ids.c.message_id == Message.id).all():
+        chat_id = row[1]
+        other_last_read = others.get(chat_id, (None, 0))[1]
+        last_messages[chat_id] = serialize_message(row, end_user_id, own_last_read[chat_id], other_last_read)
 
-def get_active_chat_details(chat_id, end_user_id):
-    other_user = ChatParticipant.query.filter(ChatParticipant.chat_id == chat_id, ChatParticipant.user_id != end_user_id).first()
-    other_username = User.query.get(other_user.user_id).username
-    recent_messages = Message.query.filter(Message.chat_id == chat_id).order_by(Message.id.desc()).limit(99).all()
-    unread_messages = 0
-    messages = []
-    for message in recent_messages:
-        if message.read == False and int(message.sender_id) != int(end_user_id):
-            unread_messages += 1
-        sender = User.query.get(message.sender_id) 
-        messages.append({
+    return [
+        {
+            'chat_id': p.chat_id,
+            'username': others.get(p.chat_id, (None, 0))[0],
+            'last_message': last_messages.get(p.chat_id),
+            'unread_message_count': p.unread_count or 0
+        }
+        for p in participants
+    ]
+
+
+def record_message(chat_id, sender_id, message_body):
+    """
+    Adds a message, then bumps the unread counter of everyone else in the
+    chat and reopens it in their inbox with one UPDATE. The caller commits.
+    """
+    message = Message(chat_id=chat_id, sender_id=sender_id, message_body=message_body, read=False)
+    db.session.add(message)
+    ChatParticipant.query.filter(
+        ChatParticipant.chat_id == chat_id,
+        ChatParticipant.user_id != sender_id
+    ).update({
+        ChatParticipant.unread_count: func.coalesce(ChatParticipant.unread_count, 0) + 1,
+        ChatParticipant.chat_active: True
+    }, synchronize_session=False)
+    return message
+
+
+def message_created_event(message, sender_username):
+    """
+    The message_created payload: the new message and each participant's
+    unread count, so clients patch their inbox in place instead of
+    refetching it. Same size whatever the size of anyone's inbox.
+    {
+        "chat_id": 3,
+        "message": {"message_id": 41, "message_body": "hi", "username": "alice", "read": false},
+        "unread_counts": {"alice": 0, "bob": 2}
+    }
+    """
+    unread_counts = dict(
+        db.session.query(User.username, ChatParticipant.unread_count)
+        .join(User, User.id == ChatParticipant.user_id)
+        .filter(ChatParticipant.chat_id == message.chat_id)
+        .all()
+    )
+    return {
+        'chat_id': message.chat_id,
+        'message': {
             'message_id': message.id,
             'message_body': message.message_body,
-            'username': sender.username,
-            'read': message.read,
-        })
+            'username': sender_username,
+            'read': False,
+        },
+        'unread_counts': unread_counts
+    }
+
+
+def active_chat_ids(user_id):
+    return [
+        chat_id for (chat_id,) in db.session.query(ChatParticipant.chat_id)
+        .filter(ChatParticipant.user_id == user_id, ChatParticipant.chat_active == True)
+        .order_by(ChatParticipant.id)
+        .all()
+    ]
+
+
+def pair_key(user_id, other_user_id):
+    """
+    The (user_low_id, user_high_id) key of the direct chat between two users.
+    """
+    return (min(user_id, other_user_id), max(user_id, other_user_id))
+
+
+# Direct chat ids by pair key. A pair's chat never changes once created,
+# so entries never go stale, they are only evicted past the size bound.
+direct_chats = LRUCache(DEFAULT_MAX_DIRECT_CHATS)
+
+
+def find_direct_chat_id(user_id, other_user_id):
+    """
+    Chat id of the direct chat between two users, or None. Served from
+    direct_chats, otherwise one lookup on the uniq_chat_pair index.
+    """
+    key = pair_key(user_id, other_user_id)
+    chat_id = direct_chats.get(key)
+    if chat_id is None:
+        chat_id = db.session.query(Chat.id).filter(
+            Chat.user_low_id == key[0],
+            Chat.user_high_id == key[1]
+        ).scalar()
+        if chat_id is not None:
+            direct_chats.put(key, chat_id)
+    return chat_id
+
+
+def get_or_create_direct_chat(user_id, other_user_id):
+    """
+    Returns (chat_id, created). A new chat gets both participants, active.
+    If another request creates the same pair first, the insert is a no-op
+    and its chat is returned. Commits when a chat is created.
+    """
+    chat_id = find_direct_chat_id(user_id, other_user_id)
+    if chat_id is not None:
+        return chat_id, False
+
+    low, high = pair_key(user_id, other_user_id)
+    result = db.session.execute(
+        sqlite_insert(Chat)
+        .values(user_low_id=low, user_high_id=high)
+        .on_conflict_do_nothing(index_elements=["user_low_id", "user_high_id"])
+    )
+    created = bool(result.rowcount)
+    chat_id = db.session.query(Chat.id).filter(Chat.user_low_id == low, Chat.user_high_id == high).scalar()
+    if created:
+        db.session.add_all([
+            ChatParticipant(chat_id=chat_id, user_id=user_id, chat_active=True),
+            ChatParticipant(chat_id=chat_id, user_id=other_user_id, chat_active=True)
+        ])
+    db.session.commit()
+    direct_chats.put((low, high), chat_id)
+    return chat_id, created
+
+
+def message_query():
+    """
+    Message columns plus the sender's username, without loading ORM objects.
+    """
+    return db.session.query(
+        Message.id, Message.chat_id, Message.sender_id, Message.message_body, User.username
+    ).join(User, User.id == Message.sender_id)
+
+
+def serialize_message(row, end_user_id, own_last_read, other_last_read):
+    """
+    "read" comes from the read watermarks: a message counts as read once
+    its recipient's last_read_message_id has reached it.
+    """
+    message_id, chat_id, sender_id, message_body, sender_username = row
+    recipient_last_read = other_last_read if int(sender_id) == int(end_user_id) else own_last_read
     return {
-        'chat_id': chat_id,
-        'username': other_username,
-        'messages': messages,
-        'unread_message_count': unread_messages
+        'message_id': message_id,
+        'message_body': message_body,
+        'username': sender_username,
+        'read': message_id <= (recipient_last_read or 0),
     }
 
 
+@chat_bp.route("/messages", methods=["GET"])
+def get_messages():
+    """
+    One page of a chat's history, newest message first, keyed on Message.id.
+    GET /chat/messages?chat_id=12&limit=50                (newest page)
+    GET /chat/messages?chat_id=12&limit=50&before=340     (older than message 340)
+    GET /chat/messages?chat_id=12&after=390               (newer than message 390)
+    {
+      "chat_id": 12,
+      "messages": [{"message_id": 391, "message_body": "...", "username": "...", "read": false}, ...],
+      "has_more": true     (more messages past the page in the direction asked for)
+    }
+    """
+    user = get_user_from_req(request)
+    if not user:
+        return jsonify({"error": "Unauthorized"}), 401
+
+    chat_id = request.args.get("chat_id", type=int)
+    before = request.args.get("before", type=int)
+    after = request.args.get("after", type=int)
+    limit = min(request.args.get("limit", MESSAGES_PAGE_SIZE, type=int), MAX_MESSAGES_PAGE_SIZE)
+    if not chat_id or limit < 1:
+        return jsonify({"error": "chat_id and a positive limit are required"}), 400
+
+    participants = ChatParticipant.query.filter_by(chat_id=chat_id).all()
+    own = next((p for p in participants if p.user_id == user.id), None)
+    if not own:
+        return jsonify({"error": "Chat not found"}), 404
+    other_last_read = max((p.last_read_message_id or 0 for p in participants if p.user_id != user.id), default=0)
+
+    query = message_query().filter(Message.chat_id == chat_id)
+    if after is not None:
+        # walk forward from the cursor, then flip to newest first like the other pages
+        query = query.filter(Message.id > after).order_by(Message.id.asc())
+    else:
+        if before is not None:
+            query = query.filter(Message.id < before)
+        query = query.order_by(Message.id.desc())
+
+    rows = query.limit(limit + 1).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    if after is not None:
+        rows.reverse()
+
+    return jsonify({
+        "chat_id": chat_id,
+        "messages": [serialize_message(row, user.id, own.last_read_message_id, other_last_read) for row in rows],
+        "has_more": has_more
+    })
+
+
 @chat_bp.route('/remove-chat', methods=['POST'])
 def remove_chat():
     user = get_user_from_req(request)
@@ -78,12 +300,12 @@ def mark_read_chat():
     data = request.get_json() 
     chat_id = data.get("chat_id")
 
-    messages = Message.query.filter_by(chat_id=chat_id, read=False).all()
-    if len(messages) > 0:
-        for message in messages:
-            if message.sender_id != user_id:
-                message.read = True
-        db.session.commit()
+    # One UPDATE: move the watermark to the newest message and clear the counter
+    newest_id = db.session.query(func.coalesce(func.max(Message.id), 0)).filter(Message.chat_id == chat_id).scalar_subquery()
+    ChatParticipant.query.filter_by(chat_id=chat_id, user_id=user_id).update({
+        ChatParticipant.last_read_message_id: newest_id,
+        ChatParticipant.unread_count: 0
+    }, synchronize_session=False)
+    db.session.commit()
 
     return jsonify({"message": "Successfully marked messages as read"})
-
@@ -2,10 +2,50 @@ import traceback
 from flask import Blueprint, request, jsonify
 from setup.extensions import db
 from models import User, Friendship
-from utils.auth_utils import get_user_from_req
+from utils.auth_utils import get_user_from_req, get_user_id_from_req
+from presence import get_presence
+from utils.lru import LRUCache
 
 friends_bp = Blueprint('friends', __name__)
 
+DEFAULT_MAX_FRIEND_LISTS = 10000
+# Other workers only see a friend being added or removed once their copy expires
+FRIEND_LIST_TTL = 60
+
+
+class FriendLists:
+    """
+    Per-process cache of user id -> (username, friend usernames) for
+    /friends/online, least recently used lists evicted past max_users.
+    /add and /remove drop the lists of both users they change.
+    """
+
+    def __init__(self, max_users=DEFAULT_MAX_FRIEND_LISTS, ttl=FRIEND_LIST_TTL):
+        self._lists = LRUCache(max_users, ttl)
+
+    def get(self, user_id):
+        """
+        Returns (username, friends), or None for an unknown user.
+        """
+        entry = self._lists.get(user_id)
+        if entry is not None:
+            return entry
+
+        username = db.session.query(User.username).filter(User.id == user_id).scalar()
+        if username is None:
+            return None
+        friends = frozenset(
+            other for (other,) in db.session.query(Friendship.username_2)
+            .filter(Friendship.username_1 == username).all()
+        )
+        return self._lists.put(user_id, (username, friends))
+
+    def invalidate(self, *usernames):
+        self._lists.discard_where(lambda user_id, entry: entry[0] in usernames)
+
+
+friend_lists = FriendLists()
+
 @friends_bp.route("/add", methods=["POST"])
 def add_friend():
     try:
@@ -40,6 +80,7 @@ def add_friend():
         new_friendship = Friendship(username_1=add_friend_username, username_2=username)
         db.session.add(new_friendship)
         db.session.commit()
+        friend_lists.invalidate(username, add_friend_username)
 
         return jsonify({"message": f"{add_friend_username} added as a friend!"}), 201
 
@@ -84,6 +125,7 @@ def remove_friend():
             return jsonify({"message": "Friendship does not exist"}), 400
         db.session.delete(friendship)
         db.session.commit()
+        friend_lists.invalidate(username, remove_friend_username)
 
         return jsonify({"message": f"{remove_friend_username} removed as a friend!"}), 201
 
@@ -119,3 +161,37 @@ def get_all_friends():
         print(f"Error in get_all_friends: {e}")
         traceback.print_exc()
         return jsonify({"message": "Server error"}), 500
+
+@friends_bp.route("/online", methods=["GET"])
+def get_online_friends():
+    """
+    Which friends are connected right now, and when the others were last
+    seen (unix time, only for friends seen since the server started).
+    Answered from the presence registry and a cached friend list, so
+    it normally reads nothing from the database.
+    {
+        "message": "Success",
+        "online": ["bob"],
+        "last_seen": {"carol": 1760000000.0}
+    }
+    """
+    try:
+        user_id = get_user_id_from_req(request)
+        friend_list = friend_lists.get(user_id) if user_id is not None else None
+        if friend_list is None:
+            return jsonify({"message": "Invalid or expired token!"}), 401
+
+        username, friends = friend_list
+        presence = get_presence()
+        online = presence.online(friends)
+
+        return jsonify({
+                        "message": "Success",
+                        "online": sorted(online),
+                        "last_seen": presence.last_seen(friends - online)
+                       }), 200
+
+    except Exception as e:
+        print(f"Error in get_online_friends: {e}")
+        traceback.print_exc()
+        return jsonify({"message": "Server error"}), 500
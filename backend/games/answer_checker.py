@@ -2,12 +2,167 @@ from flask import Blueprint, request, jsonify
 from setup.extensions import db
 from models import Answer, Game, User, Question_blitz, Word_blitz, AnswerVote, Player, QuestionSet_blitz as QuestionSet, GameQuestionBlitz
 from datetime import datetime
-from ollama import chat, ChatResponse
+import click
+from sqlalchemy import func
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from games.verdict_cache import verdict_cache, normalize_text
+from games.check_queue import check_queue
+from games.game_events import emit_to_game
+from games.verifiers import get_verifier, known_answers, VerifierError
+from games.answer_prefilter import prefilter, tier_stats
+from games.blitz_results import sync_answer
 import json
+import time
 import traceback
 
 answer_checker_bp = Blueprint('answer_checker', __name__)
 
+# Points a correct answer is worth
+ANSWER_POINTS = 10
+
+def ai_check(prompt, answer_text, game_type=None):
+    """
+    Decide whether answer_text is a correct answer to prompt. Cheap
+    pre-filter tiers run first (garbage, profanity, curated answer list),
+    then the verdict cache, and only ambiguous answers reach the verifier
+    for this game type. Verdicts are cached per (prompt, answer, verifier)
+    so repeats of the same answer ("Name an animal" / "Lion") never reach
+    the model twice.
+    Returns {"correct": bool, "explanation": str}.
+    """
+    verifier = get_verifier(game_type)
+    verdict = quick_verdict(prompt, answer_text, verifier)
+    if verdict is not None:
+        return verdict
+    return verifier_check(prompt, answer_text, verifier)
+
+def quick_verdict(prompt, answer_text, verifier):
+    """
+    The verdict from the pre-filter tiers or the verdict cache, or None when
+    only the verifier can decide.
+    """
+    tier, verdict = prefilter(answer_text, known_answers(prompt))
+    if verdict is not None:
+        return verdict
+
+    if not verifier.cacheable:
+        return None
+    start = time.perf_counter()
+    cached = verdict_cache.get(prompt, answer_text, verifier.cache_name)
+    tier_stats.record("cache", cached is not None, time.perf_counter() - start)
+    return cached
+
+def verifier_check(prompt, answer_text, verifier):
+    """
+    Asks the verifier and caches its verdict. Ends the session's transaction
+    first so no SQLite lock is held during the model call; callers commit
+    their writes before calling this.
+    """
+    db.session.commit()
+    start = time.perf_counter()
+    try:
+        verdict = verifier.verify(prompt, answer_text)
+    except VerifierError as e:
+        # Failures are not cached, the next submission retries the verifier.
+        tier_stats.record("verifier", False, time.perf_counter() - start)
+        print(f"AI error: {str(e)}")
+        return {"correct": False, "explanation": "AI verification failed"}
+    tier_stats.record("verifier", True, time.perf_counter() - start)
+
+    if verifier.cacheable:
+        verdict_cache.put(prompt, answer_text, verifier.cache_name, verdict)
+    return verdict
+
+AI_BATCH_SIZE = 20
+
+def ai_check_batch(items, game_type=None):
+    """
+    Batched version of ai_check for a list of (prompt, letter, answer_text)
+    triples. Pre-filter and cached verdicts are reused, duplicates are asked
+    once, and the rest go to the verifier AI_BATCH_SIZE at a time (one model
+    call per chunk for the Ollama backend). Like verifier_check, it ends the
+    session's transaction before the first model call.
+    Returns verdict dicts in the same order as items.
+    """
+    verifier = get_verifier(game_type)
+    results = [None] * len(items)
+
+    # Group misses by normalized (prompt, answer) so duplicates share a verdict
+    pending = {}
+    for i, (prompt, letter, answer_text) in enumerate(items):
+        tier, verdict = prefilter(answer_text, known_answers(prompt))
+        if verdict is not None:
+            results[i] = verdict
+            continue
+
+        if verifier.cacheable:
+            start = time.perf_counter()
+            cached = verdict_cache.get(prompt, answer_text, verifier.cache_name)
+            tier_stats.record("cache", cached is not None, time.perf_counter() - start)
+            if cached is not None:
+                results[i] = cached
+                continue
+        key = (normalize_text(prompt), normalize_text(answer_text))
+        pending.setdefault(key, []).append(i)
+
+    keys = list(pending)
+    if keys:
+        # No SQLite lock may be held while the model runs
+        db.session.commit()
+    for start_idx in range(0, len(keys), AI_BATCH_SIZE):
+        chunk = keys[start_idx:start_idx + AI_BATCH_SIZE]
+        firsts = [items[pending[k][0]] for k in chunk]
+        start = time.perf_counter()
+        try:
+            verdicts = verifier.verify_batch(firsts)
+            failed = False
+        except VerifierError as e:
+            print(f"AI batch error: {str(e)}")
+            verdicts = [None] * len(firsts)
+            failed = True
+        per_item = (time.perf_counter() - start) / len(firsts)
+
+        for key, (prompt, letter, answer_text), verdict in zip(chunk, firsts, verdicts):
+            if failed:
+                tier_stats.record("verifier", False, per_item)
+                verdict = {"correct": False, "explanation": "AI verification failed"}
+            elif verdict is None:
+                # The model skipped this item in its reply, ask for it on its own
+                verdict = ai_check(prompt, answer_text, game_type)
+            else:
+                tier_stats.record("verifier", True, per_item)
+                if verifier.cacheable:
+                    verdict_cache.put(prompt, answer_text, verifier.cache_name, verdict)
+            for i in pending[key]:
+                results[i] = dict(verdict)
+
+    return results
+
+def reconcile_cached_verdict(answer, final_correct):
+    """
+    Drop the cached AI verdict for this answer if a human verdict
+    (admin override or majority vote) contradicts it.
+    """
+    question = Question_blitz.query.get(answer.question_id) if answer.question_id else None
+    game = Game.query.get(answer.game_id)
+    if question and game:
+        verifier = get_verifier(game.game_type)
+        verdict_cache.invalidate_if_contradicted(question.prompt, answer.answer_text, verifier.cache_name, final_correct)
+
+def submitted_in_round(game_id, username, question_id, answer_text):
+    """
+    True if the player submitted exactly this word while the round ran.
+    Once a game is finished only those words can be checked, so the
+    post-game checker keeps working but late answers cannot score.
+    """
+    return db.session.query(
+        Word_blitz.query.filter_by(
+            game_id=game_id, username=username, question_id=question_id, word=answer_text
+        ).exists()
+    ).scalar()
+
+FINISHED_GAME_ERROR = "Game is finished, only words submitted during the round can be checked"
+
 @answer_checker_bp.route("/check1", methods=["POST"])
 def check_answer1():
     try:
@@ -26,6 +181,8 @@ def check_answer1():
         game = Game.query.get(game_id)
         if not game:
             return jsonify({"error": "Game not found"}), 404
+        if game.finished and not submitted_in_round(game.id, username, question_id, answer_text):
+            return jsonify({"error": FINISHED_GAME_ERROR}), 400
 
         user = User.query.filter_by(username=username).first()
         if not user:
@@ -45,41 +202,11 @@ def check_answer1():
         db.session.add(new_answer)
         db.session.commit()
 
-        # 2. Prepare the system prompt for AI correctness checking
-        system_prompt = (
-            "You are a correctness checker. Respond in JSON format only:\n"
-            "{\"correct\": boolean, \"explanation\": \"text\"}"
-        )
-        user_prompt = f"Question: {question.prompt}\nAnswer: {answer_text}\nIs this correct?"
+        # 2-3. Ask the AI (or the verdict cache) for correctness
+        ai_response = ai_check(question.prompt, answer_text, game.game_type)
 
-        # 3. Call the AI model (Ollama or another)
-        try:
-            response: ChatResponse = chat(
-                model="llama3.2:1b",
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt}
-                ],
-                format="json",
-            )
-            ai_response = json.loads(response.message.content)
-        except Exception as e:
-            print(f"AI error: {str(e)}")
-            ai_response = {"correct": False, "explanation": "AI verification failed"}
-
-        # 4. Update the new Answer with AI’s result
-        new_answer.ai_correct = bool(ai_response.get("correct", False))
-        new_answer.ai_result = ai_response.get("explanation", "")
-        db.session.commit()
-
-        # 5. If AI says it's correct, increment the player's score right away.
-        if new_answer.ai_correct:
-            # Lookup the Player record for this user in this game
-            player = Player.query.filter_by(game_id=game_id, username=username).first()
-            if player:
-                # Add 10 points (or 1, or any logic you desire)
-                player.score += 10
-                db.session.commit()
+        # 4-5. Update the new Answer with AI’s result, +10 points if correct
+        apply_verdict(new_answer, ai_response, username)
 
         return jsonify({
             "message": "Answer checked via AI",
@@ -112,6 +239,8 @@ def check_answer():
         game = Game.query.get(game_id)
         if not game:
             return jsonify({"error": "Game not found"}), 404
+        if game.finished and not submitted_in_round(game.id, username, question_id, answer_text):
+            return jsonify({"error": FINISHED_GAME_ERROR}), 400
 
         user = User.query.filter_by(username=username).first()
         if not user:
@@ -137,50 +266,52 @@ def check_answer():
                 "message": "No AI check or vote possible when letter doesn't match."
             }), 400
 """
-        # 3. At this point the letter matches => create the Answer row
-        new_answer = Answer(
-            game_id=game_id,
-            question_id=question_id,
-            user_id=user.id,
-            answer_text=answer_text
-        )
-        db.session.add(new_answer)
-        db.session.commit()
+        # 3. Letter mismatches, the pre-filter tiers and cached verdicts
+        #    decide right away; anything else needs the verifier.
+        verifier = get_verifier(game.game_type)
         if Correct_Letter:
-            # 4. Prepare AI system prompt
-            system_prompt = (
-                "You are a correctness checker. Respond in JSON format only:\n"
-                "{\"correct\": boolean, \"explanation\": \"text\"}"
-            )
-            user_prompt = f"Question: {question.prompt}\nAnswer: {answer_text}\nIs this correct?"
-
-            # 5. Call AI
-            try:
-                response: ChatResponse = chat(
-                    model="llama3.2:1b",
-                    messages=[
-                        {"role": "system", "content": system_prompt},
-                        {"role": "user", "content": user_prompt}
-                    ],
-                    format="json",
-                )
-                ai_response = json.loads(response.message.content)
-            except Exception as e:
-                print(f"AI error: {str(e)}")
-                ai_response = {"correct": False, "explanation": "AI verification failed"}
+            ai_response = quick_verdict(question.prompt, answer_text, verifier)
         else:
             ai_response = {"correct": False, "explanation": "Letter mismatch"}
-        # 6. Update the Answer row with AI correctness
-        new_answer.ai_correct = bool(ai_response.get("correct", False))
-        new_answer.ai_result = ai_response.get("explanation", "")
-        db.session.commit()
 
-        # 7. If AI says correct => +10 points
-        if new_answer.ai_correct:
-            player = Player.query.filter_by(game_id=game_id, username=username).first()
-            if player:
-                player.score += 10
-                db.session.commit()
+        # Async mode: queue the verifier call and return straight away. The
+        # verdict is pushed to the game room as 'answer_checked' when it lands.
+        # The queue slot is reserved before anything is written, so a busy
+        # checker leaves no Answer (or result row pointing at one) behind.
+        async_mode = bool(data.get("async")) or request.args.get("mode") == "async"
+        queued = ai_response is None and async_mode
+        if queued and not check_queue.reserve():
+            return jsonify({"error": "Answer checker is busy, try again shortly"}), 503
+
+        # 4. Create the Answer row
+        try:
+            new_answer = Answer(
+                game_id=game_id,
+                question_id=question_id,
+                user_id=user.id,
+                answer_text=answer_text
+            )
+            db.session.add(new_answer)
+            db.session.flush()
+            sync_answer(new_answer, username)
+            db.session.commit()
+        except Exception:
+            if queued:
+                check_queue.release()
+            raise
+
+        if queued:
+            check_queue.submit(run_queued_check, new_answer.id, question.prompt, username, game.room, game.game_type, reserved=True)
+            return jsonify({
+                "message": "Answer queued for AI check",
+                "ai_correct": None,
+                "answer_id": new_answer.id
+            }), 202
+
+        if ai_response is None:
+            ai_response = verifier_check(question.prompt, answer_text, verifier)
+        # 6-7. Update the Answer row with AI correctness, +10 points if correct
+        apply_verdict(new_answer, ai_response, username)
 
         return jsonify({
             "message": "Answer checked via AI",
@@ -194,6 +325,235 @@ def check_answer():
         print(f"Error in check_answer: {str(e)}")
         return jsonify({"error": "Internal server error"}), 500
 
+def claim_verdict(answer_id, verdict):
+    """
+    Stores an AI verdict on an Answer that has none yet with one conditional
+    UPDATE. Returns True when this call set it, False when another path
+    (the async queue, /check_batch) got there first; only the claiming path
+    may score the answer. The caller commits.
+    """
+    return bool(Answer.query.filter(
+        Answer.id == answer_id,
+        Answer.ai_correct.is_(None)
+    ).update({
+        Answer.ai_correct: bool(verdict.get("correct", False)),
+        Answer.ai_result: verdict.get("explanation", "")
+    }, synchronize_session=False))
+
+def correct_before_verdict(answer):
+    """
+    answer_is_correct() as it was while ai_correct was still null: an
+    override or a requested vote already decided it, otherwise not correct.
+    """
+    if answer.admin_override or answer.vote_requested:
+        return answer_is_correct(answer)
+    return False
+
+def apply_verdict(answer, verdict, username):
+    """
+    Store the AI verdict on the Answer row and award +10 to the player
+    when it is correct. A verdict for an answer that was already checked
+    is dropped. Returns whether it was stored.
+    """
+    claimed = claim_verdict(answer.id, verdict)
+    # Read back the row as claimed, inside the write transaction
+    db.session.refresh(answer)
+    if claimed:
+        apply_score_delta(answer, correct_before_verdict(answer), username)
+        sync_answer(answer, username)
+    db.session.commit()
+    return claimed
+
+def run_queued_check(answer_id, prompt, username, room, game_type=None):
+    """
+    Worker side of async /check: runs the AI call outside the request and
+    pushes the verdict to everyone in the game room.
+    """
+    answer_text = db.session.query(Answer.answer_text).filter(Answer.id == answer_id).scalar()
+    if answer_text is None:
+        return
+
+    verdict = verifier_check(prompt, answer_text, get_verifier(game_type))
+    answer = Answer.query.get(answer_id)
+    if not answer or not apply_verdict(answer, verdict, username):
+        return
+
+    emit_to_game(room, "answer_checked", {
+        "answer_id": answer.id,
+        "question_id": answer.question_id,
+        "username": username,
+        "ai_correct": answer.ai_correct,
+        "ai_result": answer.ai_result
+    })
+
+@answer_checker_bp.route("/check_batch", methods=["POST"])
+def check_batch():
+    """
+    Verify many answers with as few model calls as possible, e.g. a whole
+    WordBlitz round at once, or every unchecked answer of several games.
+    Expects either or both of:
+    {
+      "answers": [
+        {"game_id": 1, "question_id": 12, "username": "SomeUser", "answer_text": "Lion"},
+        ...
+      ],
+      "game_ids": [1, 2]   (checks every Answer in these games with ai_correct still null)
+    }
+    Answers that another check decided while the model was running are
+    left out of "results".
+    """
+    try:
+        data = request.get_json()
+        if not data:
+            return jsonify({"error": "No JSON body provided"}), 400
+
+        submissions = data.get("answers") or []
+        game_ids = data.get("game_ids") or []
+        if not isinstance(submissions, list) or not isinstance(game_ids, list):
+            return jsonify({"error": "answers and game_ids must be lists"}), 400
+        if not submissions and not game_ids:
+            return jsonify({"error": "Nothing to check"}), 400
+
+        # 1. Insert new submissions, resolving users and letters in bulk
+        new_rows = []
+        if submissions:
+            usernames = {s.get("username") for s in submissions}
+            users = {u.username: u for u in User.query.filter(User.username.in_(usernames)).all()}
+            sub_game_ids = {s.get("game_id") for s in submissions}
+            letters = {
+                (g.game_id, g.question_id): g.letter
+                for g in GameQuestionBlitz.query.filter(GameQuestionBlitz.game_id.in_(sub_game_ids)).all()
+            }
+            # Finished games only take words submitted during the round
+            finished_ids = [
+                gid for (gid,) in db.session.query(Game.id)
+                .filter(Game.id.in_(sub_game_ids), Game.finished.is_(True))
+                .all()
+            ]
+            submitted = set()
+            if finished_ids:
+                submitted = set(
+                    db.session.query(Word_blitz.game_id, Word_blitz.username, Word_blitz.question_id, Word_blitz.word)
+                    .filter(Word_blitz.game_id.in_(finished_ids))
+                    .all()
+                )
+
+            for s in submissions:
+                answer_text = (s.get("answer_text") or "").strip()
+                user = users.get(s.get("username"))
+                key = (s.get("game_id"), s.get("question_id"))
+                if not answer_text or not user or key not in letters:
+                    return jsonify({"error": f"Invalid submission: {s}"}), 400
+                if key[0] in finished_ids and (key[0], user.username, key[1], answer_text) not in submitted:
+                    return jsonify({"error": f"{FINISHED_GAME_ERROR}: {s}"}), 400
+                answer = Answer(
+                    game_id=key[0],
+                    question_id=key[1],
+                    user_id=user.id,
+                    answer_text=answer_text
+                )
+                db.session.add(answer)
+                new_rows.append(answer)
+            # Commit the inserts now, nothing may hold the write lock during the model call
+            db.session.commit()
+
+        # 2. Gather every unchecked answer (new and pending) with its prompt and letter
+        check_game_ids = set(game_ids) | {a.game_id for a in new_rows}
+        rows = (
+            db.session.query(
+                Answer.id, Answer.answer_text, User.username, Question_blitz.prompt,
+                GameQuestionBlitz.letter, Game.room, Game.game_type
+            )
+            .join(User, Answer.user_id == User.id)
+            .join(Question_blitz, Answer.question_id == Question_blitz.id)
+            .join(GameQuestionBlitz, (GameQuestionBlitz.game_id == Answer.game_id) &
+                                     (GameQuestionBlitz.question_id == Answer.question_id))
+            .join(Game, Answer.game_id == Game.id)
+            .filter(Answer.game_id.in_(check_game_ids), Answer.ai_correct.is_(None))
+            .all()
+        )
+
+        # 3. Letter mismatches are decided here, everything else goes to the
+        #    verifier in one batch per game type
+        to_model = {}
+        verdicts = {}
+        for answer_id, answer_text, username, prompt, letter, room, game_type in rows:
+            if answer_text[0].upper() != letter.upper():
+                verdicts[answer_id] = {"correct": False, "explanation": "Letter mismatch"}
+            else:
+                to_model.setdefault(game_type, []).append((answer_id, (prompt, letter, answer_text)))
+
+        for game_type, pending in to_model.items():
+            batch_verdicts = ai_check_batch([item for _, item in pending], game_type)
+            for (answer_id, _), verdict in zip(pending, batch_verdicts):
+                verdicts[answer_id] = verdict
+
+        # 4. Second, short transaction: claim each answer that is still
+        #    unchecked and score only those, so answers the async queue or
+        #    another batch got to first are not scored twice.
+        rooms = {answer_id: (username, room) for answer_id, _, username, _, _, room, _ in rows}
+        claimed = [answer_id for answer_id in verdicts if claim_verdict(answer_id, verdicts[answer_id])]
+        answers = Answer.query.filter(Answer.id.in_(claimed)).populate_existing().all() if claimed else []
+
+        score_deltas = {}
+        results_by_room = {}
+        results = []
+        for answer in answers:
+            username, room = rooms[answer.id]
+            if answer_is_correct(answer) != correct_before_verdict(answer):
+                key = (answer.game_id, username)
+                delta = ANSWER_POINTS if answer_is_correct(answer) else -ANSWER_POINTS
+                score_deltas[key] = score_deltas.get(key, 0) + delta
+            sync_answer(answer, username)
+
+            result = {
+                "answer_id": answer.id,
+                "game_id": answer.game_id,
+                "question_id": answer.question_id,
+                "username": username,
+                "ai_correct": answer.ai_correct,
+                "ai_result": answer.ai_result
+            }
+            results.append(result)
+            results_by_room.setdefault(room, []).append(result)
+
+        for (game_id, username), delta in score_deltas.items():
+            Player.query.filter_by(game_id=game_id, username=username).update(
+                {Player.score: Player.score + delta}, synchronize_session=False
+            )
+        db.session.commit()
+
+        for room, room_results in results_by_room.items():
+            emit_to_game(room, "answers_checked", {"results": room_results})
+
+        return jsonify({
+            "message": "Answers checked via AI",
+            "results": results
+        }), 200
+
+    except Exception as e:
+        db.session.rollback()
+        print(f"Error in check_batch: {str(e)}")
+        return jsonify({"error": "Internal server error"}), 500
+
+@answer_checker_bp.route("/prefilter_stats", methods=["GET"])
+def prefilter_stats():
+    """
+    Hit rate and average time per checking tier since the process started
+    (normalize, garbage, profanity, lexicon_exact, lexicon_fuzzy, cache, verifier).
+    POST /prefilter_stats/reset zeroes them.
+    """
+    return jsonify({"tiers": tier_stats.snapshot()}), 200
+
+@answer_checker_bp.route("/prefilter_stats/reset", methods=["POST"])
+def reset_prefilter_stats():
+    """
+    Zeroes the tier counters, returning what they held.
+    """
+    stats = tier_stats.snapshot()
+    tier_stats.reset()
+    return jsonify({"tiers": stats}), 200
+
 @answer_checker_bp.route("/request_vote", methods=["POST"])
 def request_vote():
     try:
@@ -230,7 +590,12 @@ def request_vote():
                 "message": "Only answer owner or admin can request votes"
             }), 403
 
+        # With no votes yet, a requested vote counts as "not correct" until the majority says otherwise
+        lock_answer(answer)
+        was_correct = answer_is_correct(answer)
         answer.vote_requested = True
+        apply_score_delta(answer, was_correct)
+        sync_answer(answer)
         db.session.commit()
 
         return jsonify({
@@ -269,45 +634,66 @@ def cast_vote():
         if not answer.vote_requested:
             return jsonify({"error": "Voting not requested for this answer"}), 400
 
-        existing_vote = AnswerVote.query.filter_by(
-            answer_id=answer_id, 
-            user_id=user.id
-        ).first()
-
-        if existing_vote:
-            existing_vote.vote_value = vote_value
+        # Read the state this vote is scored against only once no other
+        # voter can change it before we commit
+        lock_answer(answer)
+        was_correct = answer_is_correct(answer)
+
+        # Record the vote and move the tally by the difference, no COUNT queries:
+        # flipping an existing vote moves one from the other side, a first vote
+        # adds one, repeating the same vote changes nothing.
+        flipped = AnswerVote.query.filter(
+            AnswerVote.answer_id == answer_id,
+            AnswerVote.user_id == user.id,
+            AnswerVote.vote_value != vote_value
+        ).update({AnswerVote.vote_value: vote_value}, synchronize_session=False)
+
+        if flipped:
+            yes_delta, no_delta = (1, -1) if vote_value == "yes" else (-1, 1)
         else:
-            new_vote = AnswerVote(
-                answer_id=answer_id,
-                user_id=user.id,
-                vote_value=vote_value
-            )
-            db.session.add(new_vote)
-
-        yes_count = AnswerVote.query.filter_by(
-            answer_id=answer_id, 
-            vote_value="yes"
-        ).count()
-        no_count = AnswerVote.query.filter_by(
-            answer_id=answer_id, 
-            vote_value="no"
-        ).count()
-
-        answer.vote_yes = yes_count
-        answer.vote_no = no_count
+            inserted = db.session.execute(
+                sqlite_insert(AnswerVote)
+                .values(answer_id=answer_id, user_id=user.id, vote_value=vote_value)
+                .on_conflict_do_nothing(index_elements=["answer_id", "user_id"])
+            ).rowcount
+            if not inserted:
+                yes_delta, no_delta = 0, 0
+            else:
+                yes_delta, no_delta = (1, 0) if vote_value == "yes" else (0, 1)
+
+        if yes_delta or no_delta:
+            Answer.query.filter_by(id=answer.id).update({
+                Answer.vote_yes: func.coalesce(Answer.vote_yes, 0) + yes_delta,
+                Answer.vote_no: func.coalesce(Answer.vote_no, 0) + no_delta
+            }, synchronize_session=False)
+            db.session.refresh(answer, ["vote_yes", "vote_no"])
+
+        yes_count = answer.vote_yes
+        no_count = answer.vote_no
         answer.ai_correct = answer.override_value if answer.admin_override else (yes_count > no_count)
+        apply_score_delta(answer, was_correct)
+
+        # Keep the owner's Word_blitz row in sync (one UPDATE, no lookups)
+        owner_username = db.session.query(User.username).filter(User.id == answer.user_id).scalar_subquery()
+        Word_blitz.query.filter(
+            Word_blitz.game_id == answer.game_id,
+            Word_blitz.question_id == answer.question_id,
+            Word_blitz.username == owner_username
+        ).update({Word_blitz.word_correct: answer.ai_correct}, synchronize_session=False)
+        sync_answer(answer, owner_username, word_correct=answer.ai_correct)
         db.session.commit()
 
-        wb_record = Word_blitz.query.filter_by(
-            game_id=answer.game_id,
-            question_id=answer.question_id,
-            username=user.username
-        ).first()
-        if wb_record:
-            wb_record.word_correct = answer.ai_correct
-            db.session.commit()
+        if not answer.admin_override and yes_count != no_count:
+            reconcile_cached_verdict(answer, answer.ai_correct)
 
-        recalc_scores(answer.game_id)
+        room = db.session.query(Game.room).filter(Game.id == answer.game_id).scalar()
+        if room:
+            emit_to_game(room, "vote_tally", {
+                "answer_id": answer.id,
+                "vote_yes": yes_count,
+                "vote_no": no_count,
+                "final_correct": answer.ai_correct
+            })
 
         return jsonify({
             "message": "Vote cast successfully",
@@ -346,9 +732,12 @@ def admin_override():
             return jsonify({"error": "Answer not found"}), 404
 
         # Mark override
+        lock_answer(answer)
+        was_correct = answer_is_correct(answer)
         answer.admin_override = True
         answer.override_value = bool(override_value)
         answer.ai_correct = bool(override_value)
+        apply_score_delta(answer, was_correct)
         db.session.commit()
 
         # We do NOT have answer.user, so we fetch the user from answer.user_id
@@ -362,9 +751,10 @@ def admin_override():
             ).first()
             if wb_record:
                 wb_record.word_correct = bool(override_value)
-                db.session.commit()
+            sync_answer(answer, user_for_answer.username, word_correct=bool(override_value))
+            db.session.commit()
 
-        recalc_scores(answer.game_id)
+        reconcile_cached_verdict(answer, bool(override_value))
 
         return jsonify({
             "message": "Admin override applied successfully",
@@ -377,56 +767,148 @@ def admin_override():
         print(f"Error in admin_override: {str(e)}")
         return jsonify({"error": "Internal server error"}), 500
 
-def recalc_scores(game_id):
+def lock_answer(answer):
+    """
+    Takes the write lock with a no-op UPDATE of the answer row, then reloads
+    it. Call before reading the state a change is scored against: until this
+    transaction commits, no other request can change the answer's verdict,
+    votes or override in between (the sqlite driver only opens a transaction
+    at the first write, so earlier reads are not protected).
+    """
+    Answer.query.filter_by(id=answer.id).update({Answer.id: Answer.id}, synchronize_session=False)
+    db.session.refresh(answer)
+
+def answer_is_correct(answer):
+    """
+    Whether an answer currently counts towards its player's score:
+    admin override first, then the vote majority if a vote was requested,
+    otherwise the AI verdict.
+    """
+    if answer.admin_override:
+        return bool(answer.override_value)
+    if answer.vote_requested:
+        return answer.vote_yes > answer.vote_no
+    return bool(answer.ai_correct)
+
+def apply_score_delta(answer, was_correct, username=None):
+    """
+    Incremental scoring: call after changing an answer's verdict, override
+    or votes, passing answer_is_correct(answer) from before the change.
+    Moves the player's score by +/- ANSWER_POINTS with a single UPDATE when
+    the effective correctness flipped. The caller commits.
+    Returns the applied delta.
+    """
+    now_correct = answer_is_correct(answer)
+    if now_correct == was_correct or not answer.user_id:
+        return 0
+
+    if username is None:
+        username = db.session.query(User.username).filter(User.id == answer.user_id).scalar()
+        if not username:
+            return 0
+
+    delta = ANSWER_POINTS if now_correct else -ANSWER_POINTS
+    Player.query.filter_by(game_id=answer.game_id, username=username).update(
+        {Player.score: Player.score + delta}, synchronize_session=False
+    )
+    return delta
+
+# Game types recalc_scores can rebuild. Letter Match and Word Chain scores
+# come from their own tables, not from Answer rows.
+RECALC_GAME_TYPES = ("WordBlitzLocal", "WordBlitzOnline")
+
+def answer_score_totals(game_id):
     """
-    Recalculate each player's total score for the given game_id
-    by iterating over the Answer rows. If an answer is considered correct
-    (whether by admin override, majority vote, or AI correctness),
-    add points to that player's total.
+    Score per username for a Word Blitz game, rebuilt the way play awards
+    it: ANSWER_POINTS for every submitted word that starts with its letter
+    (/word_blitz/submit and /submit_all), plus ANSWER_POINTS for every
+    Answer that currently counts as correct. Three queries.
+    """
+    totals = {}
+    letters = dict(
+        db.session.query(GameQuestionBlitz.question_id, GameQuestionBlitz.letter)
+        .filter(GameQuestionBlitz.game_id == game_id)
+        .all()
+    )
+    words = (
+        db.session.query(Word_blitz.username, Word_blitz.question_id, Word_blitz.word)
+        .filter(Word_blitz.game_id == game_id)
+        .all()
+    )
+    for username, question_id, word in words:
+        totals.setdefault(username, 0)
+        letter = letters.get(question_id)
+        if word and letter and word[0].upper() == letter.upper():
+            totals[username] += ANSWER_POINTS
+
+    rows = (
+        db.session.query(Answer, User.username)
+        .join(User, Answer.user_id == User.id)
+        .filter(Answer.game_id == game_id)
+        .all()
+    )
+    for ans, username in rows:
+        totals.setdefault(username, 0)
+        if answer_is_correct(ans):
+            totals[username] += ANSWER_POINTS
+    return totals
+
+def recalc_scores(game_id, dry_run=False):
+    """
+    Full rebuild of each player's score for the given Word Blitz game from
+    its submitted words and Answer rows. Normal play keeps scores up to date
+    through apply_score_delta(); this is the verification/repair path, see
+    the "recalc-scores" command below. Other game types are skipped.
+    Returns {username: (stored score, rebuilt score)} for players that
+    were out of sync. With dry_run=True nothing is written.
     """
     try:
         game = Game.query.get(game_id)
         if not game:
-            return
-
-        # Track scores in a dict keyed by username
-        player_scores = {}
-
-        answers = Answer.query.filter_by(game_id=game_id).all()
-        for ans in answers:
-            # We only have user_id, so just do a quick lookup
-            if not ans.user_id:
-                continue
-
-            user = User.query.get(ans.user_id)  # fetch the user row
-            if not user:
-                continue
+            return {}
+        if game.game_type not in RECALC_GAME_TYPES:
+            print(f"Skipping game {game_id}: {game.game_type} scores are not kept in Answer rows")
+            return {}
 
-            username = user.username
-            if username not in player_scores:
-                player_scores[username] = 0
-
-            # Decide if this answer is "correct"
-            if ans.admin_override:
-                if ans.override_value:
-                    player_scores[username] += 10  # or +1
-            elif ans.vote_requested:
-                if ans.vote_yes > ans.vote_no:
-                    player_scores[username] += 10
-            else:
-                if ans.ai_correct:
-                    player_scores[username] += 10
-
-        # Now update each player's score in the DB
+        totals = answer_score_totals(game_id)
+        mismatches = {}
         for player in game.players:
-            if player.username in player_scores:
-                player.score = player_scores[player.username]
-            else:
-                player.score = 0
+            expected = totals.get(player.username, 0)
+            if player.score != expected:
+                mismatches[player.username] = (player.score, expected)
+                if not dry_run:
+                    player.score = expected
 
-        db.session.commit()
-        print(f"Scores recalculated for game {game_id}")
+        if not dry_run:
+            db.session.commit()
+            print(f"Scores recalculated for game {game_id}")
+        return mismatches
 
     except Exception as e:
         db.session.rollback()
         print(f"Error in recalc_scores: {str(e)}")
+        return {}
+
+@answer_checker_bp.cli.command("recalc-scores")
+@click.argument("game_ids", nargs=-1, type=int)
+@click.option("--check", is_flag=True, help="Only report players whose stored score is out of sync.")
+def recalc_scores_command(game_ids, check):
+    """
+    Verify or rebuild Word Blitz player scores from submitted words and
+    Answer rows, e.g.
+    flask --app app answer_checker recalc-scores 12 --check
+    With no game ids every Word Blitz game is processed.
+    """
+    if not game_ids:
+        game_ids = [
+            gid for (gid,) in db.session.query(Game.id)
+            .filter(Game.game_type.in_(RECALC_GAME_TYPES))
+            .order_by(Game.id)
+            .all()
+        ]
+
+    for game_id in game_ids:
+        mismatches = recalc_scores(game_id, dry_run=check)
+        for username, (stored, expected) in mismatches.items():
+            print(f"game {game_id}: {username} has {stored}, answers say {expected}")
+    print("Check finished" if check else "Repair finished")
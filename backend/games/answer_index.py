@@ -0,0 +1,124 @@
+import re
+import threading
+import time
+import unicodedata
+from sqlalchemy import event
+from sqlalchemy.orm import Session, object_session
+from models import letterMatch_answers
+
+# Safety net for edits the ORM events can't see (bulk deletes, editing the
+# SQLite file directly): the index is rebuilt at most this often.
+MAX_INDEX_AGE_SECONDS = 300
+
+ARTICLES = ("the ", "a ", "an ")
+
+
+def normalize_answer(text):
+    """
+    Canonical form used on both sides of a lookup: accents folded, lowercase,
+    punctuation dropped, leading article stripped, last word singularized.
+    "The Éagles" and "eagle" both become "eagle".
+    """
+    return singularize(_fold(text))
+
+
+def answer_forms(text):
+    """
+    Every form a player answer may be stored under: the folded text, its
+    singular, and the text minus a plain trailing "s" ("emus" -> "emu",
+    which singularize leaves alone so that "bus" stays "bus").
+    """
+    folded = _fold(text)
+    forms = {folded, singularize(folded)}
+    if folded.endswith("s") and len(folded) > 2:
+        forms.add(folded[:-1])
+    return forms
+
+
+def _fold(text):
+    text = unicodedata.normalize("NFKD", text or "")
+    text = "".join(c for c in text if not unicodedata.combining(c)).lower()
+    text = re.sub(r"[^a-z0-9\s-]", "", text)
+    text = re.sub(r"\s+", " ", text).strip()
+    for article in ARTICLES:
+        if text.startswith(article) and len(text) > len(article):
+            text = text[len(article):]
+            break
+    return text
+
+
+def singularize(text):
+    """
+    Rough English singular of the last word. It only has to be consistent,
+    since stored answers and player answers go through the same function.
+    """
+    head, _, last = text.rpartition(" ")
+    if len(last) > 4 and last.endswith("ies"):
+        last = last[:-3] + "y"
+    elif len(last) > 3 and last.endswith(("ses", "xes", "zes", "ches", "shes")):
+        last = last[:-2]
+    elif len(last) > 3 and last.endswith("s") and not last.endswith(("ss", "us", "is")):
+        last = last[:-1]
+    return f"{head} {last}" if head else last
+
+
+class AnswerIndex:
+    """
+    Process-wide index of letterMatch_answers keyed by (category_id, letter),
+    holding normalized answers. Validation is a few set lookups, no DB query.
+    Built once at startup, and marked stale whenever the ORM writes to the
+    answers table so the next lookup rebuilds it.
+    """
+
+    def __init__(self):
+        self._index = None
+        self._loaded_at = 0.0
+        self._lock = threading.Lock()
+
+    def load(self):
+        index = {}
+        rows = letterMatch_answers.query.with_entities(
+            letterMatch_answers.category_id,
+            letterMatch_answers.letter,
+            letterMatch_answers.answer
+        ).all()
+        for category_id, letter, answer in rows:
+            key = (category_id, (letter or answer[:1]).upper())
+            forms = index.setdefault(key, set())
+            forms.add(_fold(answer))
+            forms.add(normalize_answer(answer))
+        with self._lock:
+            self._index = index
+            self._loaded_at = time.time()
+        print(f"Letter match answer index loaded ({len(rows)} answers)")
+
+    def invalidate(self):
+        with self._lock:
+            self._index = None
+
+    def contains(self, category_id, letter, player_answer):
+        index = self._index
+        if index is None or time.time() - self._loaded_at > MAX_INDEX_AGE_SECONDS:
+            self.load()
+            index = self._index
+        known = index.get((category_id, letter.upper()))
+        return bool(known) and not known.isdisjoint(answer_forms(player_answer))
+
+
+answer_index = AnswerIndex()
+
+
+@event.listens_for(letterMatch_answers, "after_insert")
+@event.listens_for(letterMatch_answers, "after_update")
+@event.listens_for(letterMatch_answers, "after_delete")
+def _answers_changed(mapper, connection, target):
+    # Flag the session, the index is dropped once the change is committed
+    session = object_session(target)
+    if session is not None:
+        session.info["letter_match_answers_changed"] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _refresh_after_commit(session):
+    if session.info.pop("letter_match_answers_changed", False):
+        answer_index.invalidate()
@@ -0,0 +1,149 @@
+import difflib
+import re
+import threading
+import time
+from collections import defaultdict
+from games.verdict_cache import normalize_text
+
+MAX_ANSWER_LENGTH = 60
+FUZZY_CUTOFF = 0.85
+FUZZY_MIN_LENGTH = 4
+
+# Whole-word matches only, so "Scunthorpe" still goes through. Words with an
+# everyday meaning ("Moby Dick", "pussy willow", "cock-a-leekie") are left out
+# and go on to the verifier like any other answer.
+BLOCKED_WORDS = {
+    "fuck", "fucking", "shit", "cunt", "asshole", "slut", "whore",
+}
+
+# Tier names in the order they run. "cache" and "verifier" are recorded by
+# the answer checker after the pre-filter lets an answer through.
+TIERS = ("normalize", "garbage", "profanity", "lexicon_exact", "lexicon_fuzzy", "cache", "verifier")
+
+
+class TierStats:
+    """
+    Per-tier counters: how many answers reached a tier, how many it decided,
+    and how long it spent on them.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._checked = defaultdict(int)
+        self._hits = defaultdict(int)
+        self._seconds = defaultdict(float)
+
+    def record(self, tier, hit, seconds):
+        with self._lock:
+            self._checked[tier] += 1
+            self._seconds[tier] += seconds
+            if hit:
+                self._hits[tier] += 1
+
+    def snapshot(self):
+        with self._lock:
+            total = self._checked["normalize"]
+            out = {}
+            for tier in TIERS:
+                checked = self._checked[tier]
+                hits = self._hits[tier]
+                out[tier] = {
+                    "checked": checked,
+                    "hits": hits,
+                    "hit_rate": hits / checked if checked else 0.0,
+                    "share_of_all": hits / total if total else 0.0,
+                    "avg_ms": 1000 * self._seconds[tier] / checked if checked else 0.0,
+                }
+            return out
+
+    def reset(self):
+        with self._lock:
+            self._checked.clear()
+            self._hits.clear()
+            self._seconds.clear()
+
+
+tier_stats = TierStats()
+
+
+def _reject(reason):
+    return {"correct": False, "explanation": reason}
+
+
+def _accept(reason):
+    return {"correct": True, "explanation": reason}
+
+
+def _check_normalize(answer_norm, answers):
+    if not answer_norm:
+        return _reject("Empty answer")
+    return None
+
+
+def _check_garbage(answer_norm, answers):
+    if len(answer_norm) > MAX_ANSWER_LENGTH:
+        return _reject("Answer is too long")
+    letters = [c for c in answer_norm if c.isalpha()]
+    if len(letters) < 2:
+        # numerals and punctuation with at most the required first letter ("L123", "L!!")
+        return _reject("Answer is not a word")
+    if len(letters) >= 3 and len(set(letters)) == 1:
+        return _reject("Answer is a repeated character")
+    if re.search(r"(.)\1{3,}", answer_norm):
+        return _reject("Answer has a character repeated too many times")
+    return None
+
+
+def _check_profanity(answer_norm, answers):
+    if BLOCKED_WORDS.intersection(re.findall(r"[a-z]+", answer_norm)):
+        return _reject("Answer is not allowed")
+    return None
+
+
+def _check_lexicon_exact(answer_norm, answers):
+    if answers and answer_norm in answers:
+        return _accept("Found in the answer list")
+    return None
+
+
+def _check_lexicon_fuzzy(answer_norm, answers):
+    if not answers or len(answer_norm) < FUZZY_MIN_LENGTH:
+        return None
+    # Only compare against entries with the same first letter, the letter rule already holds
+    candidates = [a for a in answers if a[:1] == answer_norm[:1]]
+    match = difflib.get_close_matches(answer_norm, candidates, n=1, cutoff=FUZZY_CUTOFF)
+    if match:
+        return _accept(f"Close match to '{match[0]}' in the answer list")
+    return None
+
+
+_TIER_CHECKS = (
+    ("normalize", _check_normalize),
+    ("garbage", _check_garbage),
+    ("profanity", _check_profanity),
+    ("lexicon_exact", _check_lexicon_exact),
+    ("lexicon_fuzzy", _check_lexicon_fuzzy),
+)
+
+
+def prefilter(answer_text, known_answers=None):
+    """
+    Cheap checks that run before the verdict cache and the verifier.
+    known_answers is the normalized answer set for the question's category
+    (or None). Returns (tier, verdict) for the tier that decided the answer,
+    or (None, None) when the answer is ambiguous and should go to the model.
+    """
+    start = time.perf_counter()
+    answer_norm = normalize_text(answer_text)
+    normalize_seconds = time.perf_counter() - start
+
+    for tier, check in _TIER_CHECKS:
+        start = time.perf_counter()
+        verdict = check(answer_norm, known_answers)
+        elapsed = time.perf_counter() - start
+        if tier == "normalize":
+            elapsed += normalize_seconds
+        tier_stats.record(tier, verdict is not None, elapsed)
+        if verdict is not None:
+            return tier, verdict
+    return None, None
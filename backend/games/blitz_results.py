@@ -0,0 +1,120 @@
+from sqlalchemy import func, or_
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from setup.extensions import db
+from models import Answer, User, Word_blitz, WordBlitzResult
+
+# Columns copied from an Answer onto its result row
+ANSWER_FIELDS = ("ai_correct", "ai_result", "vote_requested", "vote_yes", "vote_no", "admin_override", "override_value")
+
+
+def record_words(rows):
+    """
+    Upserts result rows for freshly submitted Word_blitz rows, given as the
+    same dicts used for the Word_blitz insert (game_id, username,
+    question_id, word, word_correct). A resubmission replaces the word.
+    The caller commits.
+    """
+    if not rows:
+        return
+    stmt = sqlite_insert(WordBlitzResult).values([
+        {k: r[k] for k in ("game_id", "username", "question_id", "word", "word_correct")}
+        for r in rows
+    ])
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["game_id", "question_id", "username"],
+        set_={"word": stmt.excluded.word, "word_correct": stmt.excluded.word_correct},
+    )
+    db.session.execute(stmt)
+
+
+def sync_answer(answer, username=None, word_correct=None):
+    """
+    Copies an Answer's verdict, votes and override onto its result row with
+    one UPDATE. Older answers never overwrite newer ones, so the row always
+    shows the latest Answer, like the old max(Answer.id) lookup did.
+    Pass word_correct when the Word_blitz row was changed as well.
+    The caller commits.
+    """
+    if not answer.user_id:
+        return
+    if username is None:
+        username = db.session.query(User.username).filter(User.id == answer.user_id).scalar_subquery()
+
+    values = {getattr(WordBlitzResult, f): getattr(answer, f) for f in ANSWER_FIELDS}
+    values[WordBlitzResult.answer_id] = answer.id
+    if word_correct is not None:
+        values[WordBlitzResult.word_correct] = word_correct
+
+    WordBlitzResult.query.filter(
+        WordBlitzResult.game_id == answer.game_id,
+        WordBlitzResult.question_id == answer.question_id,
+        WordBlitzResult.username == username,
+        or_(WordBlitzResult.answer_id.is_(None), WordBlitzResult.answer_id <= answer.id)
+    ).update(values, synchronize_session=False)
+
+
+def rebuild_results(game_id):
+    """
+    Builds the result rows of a game from Word_blitz and the latest Answer
+    per player/question, for games played before the table existed.
+    Only looks at this game's rows. Commits.
+    """
+    WordBlitzResult.query.filter_by(game_id=game_id).delete(synchronize_session=False)
+
+    words = Word_blitz.query.filter_by(game_id=game_id).order_by(Word_blitz.id).all()
+    latest = {}
+    rows = (
+        db.session.query(Answer, User.username)
+        .join(User, Answer.user_id == User.id)
+        .filter(Answer.game_id == game_id)
+        .order_by(Answer.id)
+        .all()
+    )
+    for answer, username in rows:
+        latest[(answer.question_id, username)] = answer
+
+    results = {}
+    for w in words:
+        results[(w.question_id, w.username)] = {
+            "game_id": game_id,
+            "username": w.username,
+            "question_id": w.question_id,
+            "word": w.word,
+            "word_correct": w.word_correct,
+        }
+    for key, row in results.items():
+        answer = latest.get(key)
+        if answer:
+            row["answer_id"] = answer.id
+            row.update({f: getattr(answer, f) for f in ANSWER_FIELDS})
+
+    if results:
+        db.session.execute(sqlite_insert(WordBlitzResult), list(results.values()))
+    db.session.commit()
+    return len(results)
+
+
+def result_page(game_id, after_id=0, limit=None):
+    """
+    Result rows of a game in id order, starting after after_id.
+    Returns (rows, next_after_id), next_after_id is None on the last page.
+    """
+    query = WordBlitzResult.query.filter(
+        WordBlitzResult.game_id == game_id,
+        WordBlitzResult.id > after_id
+    ).order_by(WordBlitzResult.id)
+
+    if limit is None:
+        return query.all(), None
+    rows = query.limit(limit + 1).all()
+    if len(rows) > limit:
+        return rows[:limit], rows[limit - 1].id
+    return rows, None
+
+
+def needs_rebuild(game_id):
+    """
+    True for a game with Word_blitz rows but no result rows yet.
+    """
+    has_words = db.session.query(Word_blitz.id).filter_by(game_id=game_id).first() is not None
+    return has_words and not db.session.query(func.count(WordBlitzResult.id)).filter_by(game_id=game_id).scalar()
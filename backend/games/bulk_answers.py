@@ -0,0 +1,16 @@
+from sqlalchemy import insert
+from setup.extensions import db
+from models import Player
+
+
+def store_answers(model, rows, player_id, gained):
+    """
+    Saves a player's batch of answers from a submit_all request: the rows
+    (dicts of `model` columns) go in with a single INSERT and the points they
+    earned are added with a single in-place UPDATE of the player's score, so
+    concurrent submits can't overwrite each other's points. The caller commits.
+    """
+    if rows:
+        db.session.execute(insert(model), rows)
+    if gained:
+        Player.query.filter_by(id=player_id).update({Player.score: Player.score + gained})
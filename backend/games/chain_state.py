@@ -0,0 +1,90 @@
+import threading
+from collections import Counter
+from setup.extensions import db
+from models import Word
+from utils.lru import LRUCache
+
+DEFAULT_MAX_CHAINS = 2048
+
+
+def normalize_word(word):
+    """
+    What chain words are compared on: trimmed and lowercased, so "Apple"
+    and " apple" count as the same word.
+    """
+    return " ".join((word or "").split()).lower()
+
+
+class ChainState:
+    """
+    The part of a WordChain game that validation needs: the letter the next
+    word must start with, every word used so far, and the seq of the last
+    accepted word (mirrors Game.chain_seq). `lock` serializes submissions
+    to this chain within the process.
+    """
+
+    def __init__(self, last_letter, used, seq):
+        self.last_letter = last_letter
+        self.used = used
+        self.used_by_letter = Counter(w[0] for w in used)
+        self.seq = seq
+        self.lock = threading.Lock()
+
+    def check(self, word_norm):
+        """
+        Returns an error message, or None when the word may extend the chain.
+        """
+        if self.last_letter and word_norm[0] != self.last_letter:
+            return "Word does not follow the chain rule"
+        if word_norm in self.used:
+            return "That word was already used before!"
+        return None
+
+    def append(self, word_norm, seq):
+        self.used.add(word_norm)
+        self.used_by_letter[word_norm[0]] += 1
+        self.last_letter = word_norm[-1]
+        self.seq = seq
+
+
+class ChainStates:
+    """
+    Per-process cache of ChainState by game id, least recently used chains
+    evicted past max_chains. A chain is loaded with one query the first time
+    it is needed and dropped (invalidate) whenever it changes in a way
+    append() does not cover, e.g. a veto or a lost race with another worker.
+    Every change bumps Game.chain_seq, so a cached chain whose seq no longer
+    matches the game row (changed by another worker) is reloaded too.
+    """
+
+    def __init__(self, max_chains=DEFAULT_MAX_CHAINS):
+        self._states = LRUCache(max_chains)
+
+    def get(self, game):
+        state = self._states.get(game.id)
+        if state is not None and state.seq == (game.chain_seq or 0):
+            return state
+        self._states.pop(game.id)
+
+        # Another request may have loaded it meanwhile, keep theirs (and its lock)
+        return self._states.setdefault(game.id, self._load(game))
+
+    def invalidate(self, game_id):
+        self._states.pop(game_id)
+
+    def _load(self, game):
+        rows = (
+            db.session.query(Word.word, Word.word_norm)
+            .filter(Word.game_id == game.id)
+            .order_by(Word.seq, Word.id)
+            .all()
+        )
+        used = {word_norm or normalize_word(word) for word, word_norm in rows}
+        last_letter = None
+        if rows:
+            last_word, last_norm = rows[-1]
+            last_letter = (last_norm or normalize_word(last_word))[-1]
+        return ChainState(last_letter, used, game.chain_seq or 0)
+
+
+chain_states = ChainStates()
@@ -0,0 +1,78 @@
+import queue
+import threading
+from flask import current_app
+from setup.extensions import socketio
+
+DEFAULT_WORKERS = 4
+DEFAULT_MAX_PENDING = 256
+
+
+class CheckQueue:
+    """
+    Bounded worker pool for AI answer checks.
+
+    Jobs are plain (func, args) pairs run inside an app context by a fixed
+    number of background tasks started through socketio, so they are green
+    threads under eventlet and ordinary threads otherwise. submit() never
+    blocks: when the backlog is full it returns False and the caller decides
+    what to tell the client. Callers that have to write something before the
+    job exists reserve() a slot first, so a full backlog is known up front.
+    """
+
+    def __init__(self, workers=DEFAULT_WORKERS, max_pending=DEFAULT_MAX_PENDING):
+        self.workers = workers
+        self.max_pending = max_pending
+        self._jobs = queue.Queue()
+        self._reserved = 0  # queued jobs plus reservations not submitted yet
+        self._lock = threading.Lock()
+        self._app = None
+        self._start_lock = threading.Lock()
+
+    def reserve(self):
+        """
+        Claims room for one job. Returns False when the backlog is full.
+        A successful reserve() must be followed by submit(..., reserved=True)
+        or release().
+        """
+        with self._lock:
+            if self._reserved >= self.max_pending:
+                return False
+            self._reserved += 1
+            return True
+
+    def release(self):
+        with self._lock:
+            self._reserved -= 1
+
+    def submit(self, func, *args, reserved=False):
+        if not reserved and not self.reserve():
+            return False
+        if self._app is None:
+            with self._start_lock:
+                if self._app is None:
+                    self._start(current_app._get_current_object())
+        self._jobs.put_nowait((func, args))
+        return True
+
+    def pending(self):
+        return self._jobs.qsize()
+
+    def _start(self, app):
+        self._app = app
+        for _ in range(self.workers):
+            socketio.start_background_task(self._work)
+
+    def _work(self):
+        while True:
+            func, args = self._jobs.get()
+            self.release()
+            try:
+                with self._app.app_context():
+                    func(*args)
+            except Exception as e:
+                print(f"Error in check worker: {str(e)}")
+            finally:
+                self._jobs.task_done()
+
+
+check_queue = CheckQueue()
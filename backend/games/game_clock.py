@@ -0,0 +1,179 @@
+import heapq
+import threading
+import time
+from datetime import datetime, timedelta
+from flask import current_app
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from setup.extensions import db, socketio
+from models import Game, Player, GameDeadline
+from games.game_events import emit_to_game
+from games.state_cache import bump_state_version
+
+# How often running rounds get a 'timer_tick', and the longest the loop sleeps
+TICK_SECONDS = 5
+MAX_SLEEP_SECONDS = 1.0
+
+# Pass-and-play games: a deadline only ends the current player's turn
+TURN_BASED_GAME_TYPES = ("LetterMatchLocal",)
+
+EPOCH = datetime(1970, 1, 1)
+
+
+class GameClock:
+    """
+    The authoritative clock for every running round, one background loop
+    for all rooms. Deadlines sit in a heap of (fire_at, room, kind, ends_at)
+    entries, where kind is "tick" or "end". Rescheduling a room just pushes
+    new entries; the stale ones are recognised by their ends_at and skipped.
+
+    Each deadline is also a row in game_deadline, so rounds still end after
+    a restart (load_pending), and when several workers run the clock only
+    the one that flips the row's fired flag finalizes the round.
+    """
+
+    def __init__(self):
+        self._heap = []
+        self._deadlines = {}  # room -> ends_at (epoch seconds)
+        self._lock = threading.Lock()
+        self._app = None
+
+    def schedule_round_end(self, game, ends_at):
+        """
+        ends_at is a naive UTC datetime (usually Game.start_time + time_limit).
+        Writes the deadline row into the current session, the caller commits.
+        """
+        stmt = sqlite_insert(GameDeadline).values(room=game.room, game_id=game.id, ends_at=ends_at, fired=False)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["room"],
+            set_={"game_id": stmt.excluded.game_id, "ends_at": stmt.excluded.ends_at, "fired": False},
+        )
+        db.session.execute(stmt)
+        self._push(game.room, ends_at)
+        self._ensure_started()
+
+    def cancel(self, room):
+        """
+        Drops the room's pending deadline, the caller commits.
+        """
+        with self._lock:
+            self._deadlines.pop(room, None)
+        GameDeadline.query.filter_by(room=room, fired=False).update({"fired": True}, synchronize_session=False)
+
+    def load_pending(self, app):
+        """
+        Called once at startup: re-arms every deadline that had not fired.
+        Ones that passed while the server was down fire right away.
+        """
+        rows = GameDeadline.query.filter_by(fired=False).all()
+        for row in rows:
+            self._push(row.room, row.ends_at)
+        with self._lock:
+            if self._app is None:
+                self._app = app
+                socketio.start_background_task(self._run)
+        print(f"Game clock loaded ({len(rows)} pending deadlines)")
+
+    def _push(self, room, ends_at):
+        ends_at = (ends_at - EPOCH).total_seconds()
+        now = time.time()
+        with self._lock:
+            self._deadlines[room] = ends_at
+            if now + TICK_SECONDS < ends_at:
+                heapq.heappush(self._heap, (now + TICK_SECONDS, room, "tick", ends_at))
+            heapq.heappush(self._heap, (ends_at, room, "end", ends_at))
+
+    def _ensure_started(self):
+        if self._app is None:
+            with self._lock:
+                if self._app is None:
+                    self._app = current_app._get_current_object()
+                    socketio.start_background_task(self._run)
+
+    def _run(self):
+        while True:
+            for room, kind, ends_at in self._pop_due():
+                try:
+                    with self._app.app_context():
+                        if kind == "tick":
+                            emit_to_game(room, "timer_tick", {"room": room, "time_left": max(round(ends_at - time.time()), 0)})
+                        else:
+                            self._on_round_end(room)
+                except Exception as e:
+                    print(f"Error in game clock for {room}: {str(e)}")
+            socketio.sleep(self._sleep_for())
+
+    def _pop_due(self):
+        due = []
+        now = time.time()
+        with self._lock:
+            while self._heap and self._heap[0][0] <= now:
+                fire_at, room, kind, ends_at = heapq.heappop(self._heap)
+                if self._deadlines.get(room) != ends_at:
+                    continue  # rescheduled or cancelled
+                if kind == "tick":
+                    if fire_at + TICK_SECONDS < ends_at:
+                        heapq.heappush(self._heap, (fire_at + TICK_SECONDS, room, "tick", ends_at))
+                else:
+                    del self._deadlines[room]
+                due.append((room, kind, ends_at))
+        return due
+
+    def _sleep_for(self):
+        with self._lock:
+            if not self._heap:
+                return MAX_SLEEP_SECONDS
+            return min(max(self._heap[0][0] - time.time(), 0), MAX_SLEEP_SECONDS)
+
+    def _on_round_end(self, room):
+        # Claim the deadline; 0 rows means another worker fired it or it was pushed back
+        now = datetime.utcnow() + timedelta(seconds=1)
+        claimed = GameDeadline.query.filter(
+            GameDeadline.room == room,
+            GameDeadline.fired.is_(False),
+            GameDeadline.ends_at <= now
+        ).update({"fired": True}, synchronize_session=False)
+        if not claimed:
+            db.session.rollback()
+            return
+
+        game = Game.query.filter_by(room=room).first()
+        if not game:
+            db.session.commit()
+            return
+
+        if game.game_type in TURN_BASED_GAME_TYPES:
+            db.session.commit()
+            emit_to_game(room, "turn_ended", {"room": room})
+            return
+
+        players = Player.query.filter_by(game_id=game.id).order_by(Player.score.desc()).all()
+        finalize_game(game)
+        bump_state_version(game)
+        db.session.commit()
+
+        emit_to_game(room, "game_ended", {
+            "room": room,
+            "players": [{"username": p.username, "score": p.score} for p in players]
+        })
+
+
+def round_time_left(game):
+    """
+    Seconds left in the game's running round, from the game row
+    (start_time + time_limit) so every worker gives the same answer, not
+    just the one whose clock scheduled the round. None when no round runs.
+    """
+    if not game.started or game.finished or not game.start_time or not game.time_limit:
+        return None
+    remaining = (game.start_time + timedelta(seconds=game.time_limit) - datetime.utcnow()).total_seconds()
+    return max(int(remaining), 0)
+
+
+def finalize_game(game):
+    """
+    Closes submissions. Does not commit.
+    """
+    game.finished = True
+
+
+game_clock = GameClock()
@@ -0,0 +1,20 @@
+from setup.extensions import socketio
+
+
+def game_room_name(room):
+    """
+    SocketIO room for a game. Prefixed so it can never collide with the
+    integer chat ids used as chat rooms.
+    """
+    return f"game:{room}"
+
+
+def emit_to_game(room, event, data):
+    """
+    Push an event to every client that joined the game's room via 'join_game'.
+    Safe to call from request handlers and background workers alike.
+    """
+    try:
+        socketio.emit(event, data, to=game_room_name(room))
+    except Exception as e:
+        print(f"Error emitting {event} to {room}: {str(e)}")
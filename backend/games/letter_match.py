@@ -1,8 +1,9 @@
 import random
 import logging
-from datetime import datetime
-from flask import Blueprint, request, jsonify
+from datetime import datetime, timedelta
+from flask import Blueprint, request, jsonify, make_response
 from sqlalchemy import func
+from sqlalchemy.orm import joinedload
 from setup.extensions import db
 from models import (
     Game,
@@ -12,6 +13,11 @@ from models import (
     playerAnswer_LetterMatch,
     letterMatch_answers,
 )
+from games.answer_index import answer_index, normalize_answer
+from games.state_cache import letter_match_states, bump_state_version
+from games.game_events import emit_to_game
+from games.game_clock import game_clock
+from games.bulk_answers import store_answers
 
 letter_match_bp = Blueprint('letter_match', __name__)
 
@@ -19,15 +25,13 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 #to validate the player's answer is correct
-def validate_answer(question_id, player_answer):
-    # Get all valid answers for the question/category
-    correct_answers = letterMatch_answers.query.filter_by(category_id=question_id).all()
-
-    # creates correct answer set in uppercase
-    correct_answers_set = {a.answer.lower() for a in correct_answers}
-
-    # check if player answer = correct answer in db
-    return player_answer.strip().lower() in correct_answers_set
+def validate_answer(question_id, player_answer, letter=None):
+    # O(1) lookup in the in-memory answer index, no DB query.
+    # Accents, leading articles and plurals are normalized on both sides.
+    letter = letter or normalize_answer(player_answer)[:1]
+    if not letter:
+        return False
+    return answer_index.contains(question_id, letter, player_answer)
 
 
 
@@ -141,7 +145,9 @@ def join_game():
     # otherwise add them
     p = Player(username=username, game_id=game.id, score=0)
     db.session.add(p)
+    bump_state_version(game)
     db.session.commit()
+    emit_to_game(room, "player_joined", {"room": room, "username": username})
 
     return jsonify({
         'message': 'Joined game',
@@ -194,6 +200,8 @@ def start_game():
 
         game.started = True
         game.start_time = datetime.utcnow()
+        game_clock.schedule_round_end(game, game.start_time + timedelta(seconds=game.time_limit))
+        bump_state_version(game)
         db.session.commit()
 
         # Return them as {question_id, prompt, letter}
@@ -215,6 +223,13 @@ def start_game():
                 'is_creator': p.is_creator
             })
 
+        emit_to_game(room, "game_started", {
+            'room': room,
+            'letter': chosen_letter,
+            'questions': output_questions,
+            'time_limit': game.time_limit
+        })
+
         return jsonify({
             'message': 'Game started',
             'letter': chosen_letter,
@@ -228,63 +243,95 @@ def start_game():
         return jsonify({'error': 'Server error while starting game'}), 500
 
 
+def build_state_snapshot(game):
+    """
+    The cacheable part of get_state for a game loaded with its players and
+    questions eagerly (see load_game_for_state).
+    """
+    return {
+        'version': game.state_version,
+        'started': game.started,
+        'finished': bool(game.finished),
+        'start_time': game.start_time,
+        'time_limit': game.time_limit,
+        'players': [
+            {'id': p.id, 'username': p.username, 'score': p.score}
+            for p in game.players
+        ],
+        'questions': [
+            {'question_id': gq.question.id, 'prompt': gq.question.prompt, 'letter': gq.letter}
+            for gq in sorted(game.letter_match_questions, key=lambda gq: gq.id)
+            if gq.question
+        ],
+    }
+
+
+def load_game_for_state(room):
+    # Game, players, question assignments and prompts in a single joined query
+    return (
+        Game.query
+        .options(
+            joinedload(Game.players),
+            joinedload(Game.letter_match_questions).joinedload(game_question_lettermatch.question),
+        )
+        .filter_by(room=room)
+        .first()
+    )
+
+
 @letter_match_bp.route('/get_state', methods=['GET'])
 def get_state():
     room = request.args.get('room')
     if not room:
         return jsonify({'error': 'Room is required'}), 400
 
-    game = Game.query.filter_by(room=room).first()
-    if not game:
+    # One scalar query per poll; the snapshot is rebuilt only when it moved
+    version = db.session.query(Game.state_version).filter_by(room=room).scalar()
+    if version is None:
         return jsonify({'error': 'Game not found'}), 404
+    snapshot = letter_match_states.get(room, version)
+    if snapshot is None:
+        game = load_game_for_state(room)
+        if not game:
+            return jsonify({'error': 'Game not found'}), 404
+        snapshot = letter_match_states.put(room, build_state_snapshot(game))
+
+    # The client counts down from ends_at, so the ETag stays put while a round runs
+    time_left = 0
+    ends_at = None
+    game_ended = snapshot['finished']
+    if snapshot['started'] and snapshot['start_time'] and snapshot['time_limit'] and not game_ended:
+        ends = snapshot['start_time'] + timedelta(seconds=snapshot['time_limit'])
+        ends_at = ends.isoformat() + 'Z'
+        remaining = (ends - datetime.utcnow()).total_seconds()
+        if remaining > 0:
+            time_left = int(remaining)
+        else:
+            game_ended = True
 
-    if game.started and game.start_time:
-        elapsed = (datetime.utcnow() - game.start_time).total_seconds()
-        game_ended = elapsed >= game.time_limit
-    else:
-        game_ended = False
+    # Unchanged since the client's last poll: no body at all
+    etag = f"{snapshot['version']}-ended" if game_ended else str(snapshot['version'])
+    if request.if_none_match.contains(etag):
+        response = make_response('', 304)
+        response.set_etag(etag)
+        return response
 
     # sorts by score when game is over
     if game_ended:
-        players = Player.query.filter_by(game_id=game.id).order_by(Player.score.desc()).all()
+        players = sorted(snapshot['players'], key=lambda p: p['score'], reverse=True)
     else:
-        players = Player.query.filter_by(game_id=game.id).order_by(Player.id).all()
-
-    player_data = []
-    for p in players:
-        player_data.append({
-            'username': p.username,
-            'score': p.score
-        })
-
-    # Gather questions
-    gq_list = game_question_lettermatch.query.filter_by(game_id=game.id).all()
-    questions_data = []
-    for gq in gq_list:
-        q_obj = question_LetterMatch.query.get(gq.question_id)
-        if q_obj:
-            questions_data.append({
-                'question_id': q_obj.id,
-                'prompt': q_obj.prompt,
-                'letter': gq.letter
-            })
-
-    # Time left
-    time_left = 0
-    if game.start_time and game.time_limit:
-        elapsed = (datetime.utcnow() - game.start_time).total_seconds()
-        if elapsed < game.time_limit:
-            time_left = int(game.time_limit - elapsed)
-        else:
-            time_left = 0
-
-    return jsonify({
-        'started': game.started,
-        'players': player_data,
-        'questions': questions_data,
+        players = sorted(snapshot['players'], key=lambda p: p['id'])
+
+    response = jsonify({
+        'started': snapshot['started'],
+        'finished': game_ended,
+        'players': [{'username': p['username'], 'score': p['score']} for p in players],
+        'questions': snapshot['questions'],
+        'ends_at': ends_at,
         'time_left': time_left
-         
     })
+    response.set_etag(etag)
+    return response
 
 
 @letter_match_bp.route('/open_games', methods=['GET'])
@@ -336,9 +383,9 @@ def submit_all_answers():
         print(f"Player {username} not found in game {room}")
         return jsonify({'error': 'Player not found in this game'}), 404
 
-    # Time check
+    # Time check (the game clock sets finished when an online round ends)
     elapsed = (datetime.utcnow() - game.start_time).total_seconds() if game.start_time else 0
-    if elapsed > game.time_limit:
+    if game.finished or elapsed > game.time_limit:
         print(f"Time is up for {username}. Elapsed: {elapsed:.2f}s")
 
         # Optional: Mark timeout somehow if needed, like setting a flag
@@ -356,6 +403,8 @@ def submit_all_answers():
             game.current_turn = next_index #assigns next player to current player
 
             game.start_time = datetime.utcnow() #reset time for new playeer
+            game_clock.schedule_round_end(game, game.start_time + timedelta(seconds=game.time_limit))
+            bump_state_version(game)
             db.session.commit()
 
         return jsonify({
@@ -366,57 +415,65 @@ def submit_all_answers():
 
     results = {}
     try:
+        # One query for every question/letter assignment in this game
+        letters = dict(
+            db.session.query(game_question_lettermatch.question_id, game_question_lettermatch.letter)
+            .filter(game_question_lettermatch.game_id == game.id)
+            .all()
+        )
+
+        new_rows = []
+        gained = 0
         for qid_str, word in answers_map.items():
             if not word:
                 continue
 
-            qid = int(qid_str)
-            gqb = game_question_lettermatch.query.filter_by(game_id=game.id, question_id=qid).first()
-            if not gqb:
+            try:
+                qid = int(qid_str)
+            except (TypeError, ValueError):
+                qid = None
+            required_letter = letters.get(qid)
+            if not required_letter:
                 results[qid_str] = {"word": word, "status": "❌ Invalid question"}
                 continue
 
-            if word[0].upper() != gqb.letter.upper():
-                results[qid_str] = {"word": word, "status": f"❌ Must start with {gqb.letter}"}
+            if word[0].upper() != required_letter.upper():
+                results[qid_str] = {"word": word, "status": f"❌ Must start with {required_letter}"}
                 continue
 
-            #inserttt
-            required_letter = gqb.letter
-            is_correct = False
-            score = 0
+            # In-memory validation, no DB query
+            is_correct = validate_answer(qid, word, required_letter)
+            score = 10 if is_correct else 0
+            status_msg = "✅ Accepted" if is_correct else "❌ Not a valid answer"
+
+            new_rows.append({
+                "game_id": game.id,
+                "player_id": player.id,
+                "question_id": qid,
+                "answer": word,
+                "is_correct": is_correct,
+                "score": score
+            })
+            gained += score
+            results[qid_str] = {"word": word, "status": status_msg}
 
-            if word[0].upper() != required_letter.upper():
-                status_msg = f"❌ Must start with {required_letter}"
-            else:
-                if validate_answer(qid, word):
-                    is_correct = True
-                    score = 10
-                    status_msg = "✅ Accepted"
-                else:
-                    status_msg = "❌ Not a valid answer"
-
-            # Save answer with correct validation
-            new_ans = playerAnswer_LetterMatch(
-                game_id=game.id,
-                player_id=player.id,
-                question_id=qid,
-                answer=word,
-                is_correct=is_correct
-            )
-            db.session.add(new_ans)
+        store_answers(playerAnswer_LetterMatch, new_rows, player.id, gained)
 
-            player.score += score
-            results[qid_str] = {"word": word, "status": status_msg}
+        if new_rows and game.game_type == "LetterMatchLocal":
+            # Local games pass the device on: the next player's clock starts now
+            game.start_time = datetime.utcnow()
+            game_clock.schedule_round_end(game, game.start_time + timedelta(seconds=game.time_limit))
 
-            db.session.commit()
+        if new_rows:
+            bump_state_version(game)
+        db.session.commit()
 
-            if game.game_type == "LetterMatchLocal":
-                players = Player.query.filter_by(game_id=game.id).order_by(Player.id).all()
-                current_index = next((i for i, p in enumerate(players) if p.username == username), 0)
-                next_index = (current_index + 1) % len(players)
-                game.current_turn = next_index
-                game.start_time = datetime.utcnow()
-                db.session.commit()
+        emit_to_game(room, "answer_scored", {
+            "room": room,
+            "username": username,
+            "question_ids": list(results),
+            "score": player.score
+        })
 
         return jsonify({
             "message": "All answers submitted!",
@@ -0,0 +1,66 @@
+import random
+import threading
+import time
+from models import Question_blitz as Question, QuestionSet_blitz as QuestionSet
+
+# /add_questions only reloads the worker that handled it; every other worker
+# picks up new sets after at most this long.
+MAX_CATALOG_AGE_SECONDS = 60
+
+
+class QuestionCatalog:
+    """
+    Process-wide copy of the Word Blitz question sets: set id -> list of
+    (question_id, prompt), plus a question_id -> prompt map. Question sets
+    only change through /add_questions, which reloads it, so starting a game
+    never has to read them from the database. Other workers rebuild their
+    copy once it is older than MAX_CATALOG_AGE_SECONDS, and a prompt that is
+    not in the copy yet is read from the database.
+    """
+
+    def __init__(self):
+        self._sets = None
+        self._prompts = {}
+        self._loaded_at = 0.0
+        self._lock = threading.Lock()
+
+    def load(self):
+        sets = {s.id: [] for s in QuestionSet.query.with_entities(QuestionSet.id).all()}
+        prompts = {}
+        rows = Question.query.with_entities(
+            Question.id, Question.prompt, Question.question_set_id
+        ).order_by(Question.id).all()
+        for question_id, prompt, set_id in rows:
+            sets.setdefault(set_id, []).append((question_id, prompt))
+            prompts[question_id] = prompt
+        with self._lock:
+            self._sets = sets
+            self._prompts = prompts
+            self._loaded_at = time.time()
+        print(f"Word blitz question catalog loaded ({len(sets)} sets, {len(rows)} questions)")
+
+    def random_set(self):
+        """
+        Returns the (question_id, prompt) list of a random non-empty set, or None.
+        """
+        self._refresh_if_stale()
+        candidates = [questions for questions in self._sets.values() if questions]
+        return random.choice(candidates) if candidates else None
+
+    def prompt(self, question_id):
+        self._refresh_if_stale()
+        prompt = self._prompts.get(question_id)
+        if prompt is None:
+            # Added by another worker since the last load
+            prompt = Question.query.with_entities(Question.prompt).filter_by(id=question_id).scalar()
+            if prompt is not None:
+                with self._lock:
+                    self._prompts[question_id] = prompt
+        return prompt
+
+    def _refresh_if_stale(self):
+        if self._sets is None or time.time() - self._loaded_at > MAX_CATALOG_AGE_SECONDS:
+            self.load()
+
+
+question_catalog = QuestionCatalog()
@@ -0,0 +1,43 @@
+from models import Game
+from utils.lru import LRUCache
+
+DEFAULT_MAX_ROOMS = 2048
+
+
+def bump_state_version(game):
+    """
+    Marks the game's cached state as stale on every worker. Call it in the
+    same transaction as the change, the caller commits.
+    """
+    game.state_version = Game.state_version + 1
+
+
+class GameStateCache:
+    """
+    Per-room snapshot of the slow-changing part of a game's state (players,
+    scores, questions, start time), so polling get_state costs one scalar
+    query until something changes. Each snapshot is tagged with the
+    Game.state_version it was built from; mutating endpoints bump that
+    column (bump_state_version) in the same transaction as their change, so
+    a snapshot held by any worker stops matching as soon as the change
+    commits. The endpoints also use the version to build their ETag.
+    Snapshots are per process; the oldest rooms are evicted past max_rooms.
+    """
+
+    def __init__(self, max_rooms=DEFAULT_MAX_ROOMS):
+        self._snapshots = LRUCache(max_rooms)
+
+    def get(self, room, version):
+        """
+        The room's snapshot if it was built from this state_version, else None.
+        """
+        snapshot = self._snapshots.get(room)
+        if snapshot is None or snapshot["version"] != version:
+            return None
+        return snapshot
+
+    def put(self, room, snapshot):
+        return self._snapshots.put(room, snapshot)
+
+
+letter_match_states = GameStateCache()
@@ -0,0 +1,128 @@
+import hashlib
+import re
+from datetime import datetime, timedelta
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from setup.extensions import db
+from models import AnswerVerdictCache
+from utils.lru import LRUCache
+
+# How many verdicts we keep in memory per process, and how long a verdict
+# (in memory or in the answer_verdict_cache table) is trusted.
+DEFAULT_MAX_ENTRIES = 4096
+DEFAULT_TTL_SECONDS = 7 * 24 * 60 * 60
+
+
+def normalize_text(text):
+    """
+    Lowercase, trim, collapse whitespace and drop surrounding punctuation so
+    "Lion", " lion " and "lion." all share one cache entry.
+    """
+    text = re.sub(r"\s+", " ", (text or "").strip().lower())
+    return text.strip(" .,!?;:'\"")
+
+
+def make_cache_key(prompt_norm, answer_norm, model_name):
+    raw = f"{model_name}\x1f{prompt_norm}\x1f{answer_norm}"
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class VerdictCache:
+    """
+    Two-tier cache of AI verdicts for (question prompt, answer, model).
+
+    Tier 1 is an in-process LRU, tier 2 is the answer_verdict_cache table so
+    verdicts survive restarts and are shared between worker processes.
+    Both tiers honour the same TTL.
+    """
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES, ttl_seconds=DEFAULT_TTL_SECONDS):
+        self.ttl_seconds = ttl_seconds
+        self._lru = LRUCache(max_entries, ttl_seconds)  # cache_key -> (prompt_norm, answer_norm, verdict)
+
+    def get(self, prompt, answer_text, model_name):
+        """
+        Returns the cached verdict dict ({"correct", "explanation"}) or None.
+        """
+        prompt_norm = normalize_text(prompt)
+        answer_norm = normalize_text(answer_text)
+        key = make_cache_key(prompt_norm, answer_norm, model_name)
+
+        entry = self._lru.get(key)
+        if entry is not None:
+            return dict(entry[2])
+
+        cutoff = datetime.utcnow() - timedelta(seconds=self.ttl_seconds)
+        row = AnswerVerdictCache.query.filter_by(cache_key=key).first()
+        if not row or row.date_created < cutoff:
+            return None
+
+        verdict = {"correct": row.correct, "explanation": row.explanation or ""}
+        # Only trusted in memory for what is left of the row's TTL
+        self._lru.put(key, (prompt_norm, answer_norm, verdict), ttl=(row.date_created - cutoff).total_seconds())
+        return dict(verdict)
+
+    def put(self, prompt, answer_text, model_name, verdict):
+        prompt_norm = normalize_text(prompt)
+        answer_norm = normalize_text(answer_text)
+        key = make_cache_key(prompt_norm, answer_norm, model_name)
+        verdict = {
+            "correct": bool(verdict.get("correct", False)),
+            "explanation": verdict.get("explanation", ""),
+        }
+
+        self._lru.put(key, (prompt_norm, answer_norm, verdict))
+
+        try:
+            stmt = sqlite_insert(AnswerVerdictCache).values(
+                cache_key=key,
+                model_name=model_name,
+                prompt_norm=prompt_norm,
+                answer_norm=answer_norm,
+                correct=verdict["correct"],
+                explanation=verdict["explanation"],
+                date_created=datetime.utcnow(),
+            )
+            stmt = stmt.on_conflict_do_update(
+                index_elements=["cache_key"],
+                set_={
+                    "correct": stmt.excluded.correct,
+                    "explanation": stmt.excluded.explanation,
+                    "date_created": stmt.excluded.date_created,
+                },
+            )
+            db.session.execute(stmt)
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            print(f"Error writing verdict cache: {str(e)}")
+
+    def invalidate(self, prompt, answer_text):
+        """
+        Drops every cached verdict (any model) for this prompt/answer pair.
+        """
+        prompt_norm = normalize_text(prompt)
+        answer_norm = normalize_text(answer_text)
+
+        self._lru.discard_where(lambda key, entry: entry[0] == prompt_norm and entry[1] == answer_norm)
+
+        AnswerVerdictCache.query.filter_by(prompt_norm=prompt_norm, answer_norm=answer_norm).delete()
+        db.session.commit()
+
+    def invalidate_if_contradicted(self, prompt, answer_text, model_name, final_correct):
+        """
+        Called when a human verdict (admin override or majority vote) lands.
+        If the cached AI verdict disagrees with it, the entry is dropped so the
+        next submission of the same answer is not judged by a known-bad verdict.
+        """
+        cached = self.get(prompt, answer_text, model_name)
+        if cached is not None and cached["correct"] != bool(final_correct):
+            print(f"Invalidating cached verdict for '{answer_text}' ({prompt})")
+            self.invalidate(prompt, answer_text)
+            return True
+        return False
+
+    def clear_memory(self):
+        self._lru.clear()
+
+
+verdict_cache = VerdictCache()
@@ -0,0 +1,227 @@
+import json
+import os
+from abc import ABC, abstractmethod
+import random
+import time
+from flask import current_app
+from games.verdict_cache import normalize_text
+
+try:
+    from ollama import chat, ChatResponse
+except ImportError:  # lets CI boxes without the ollama package use the other verifiers
+    chat, ChatResponse = None, None
+
+DEFAULT_OLLAMA_MODEL = "llama3.2:1b"
+DEFAULT_FAKE_SEED = 0
+LEXICON_PATH = os.path.join(os.path.dirname(__file__), "data", "blitz_lexicon.json")
+
+
+class VerifierError(Exception):
+    """Raised by a verifier when it could not produce a verdict."""
+
+
+class AnswerVerifier(ABC):
+    """
+    Decides whether an answer is correct for a question prompt.
+
+    verify() returns {"correct": bool, "explanation": str} or raises
+    VerifierError. verify_batch() takes (prompt, letter, answer_text) triples
+    and returns one verdict per item, or None where it has no verdict for an
+    item; the default just calls verify() per item.
+    cache_name is what the verdict cache keys on, so verdicts from different
+    backends never mix; backends with cacheable = False bypass the verdict
+    cache entirely.
+    """
+    cache_name = "base"
+    cacheable = True
+
+    @abstractmethod
+    def verify(self, prompt, answer_text):
+        ...
+
+    def verify_batch(self, items):
+        return [self.verify(prompt, answer_text) for prompt, letter, answer_text in items]
+
+
+class OllamaVerifier(AnswerVerifier):
+    def __init__(self, model=DEFAULT_OLLAMA_MODEL):
+        self.model = model
+        self.cache_name = model
+
+    def verify(self, prompt, answer_text):
+        system_prompt = (
+            "You are a correctness checker. Respond in JSON format only:\n"
+            "{\"correct\": boolean, \"explanation\": \"text\"}"
+        )
+        user_prompt = f"Question: {prompt}\nAnswer: {answer_text}\nIs this correct?"
+
+        ai_response = self._chat(system_prompt, user_prompt)
+        return {
+            "correct": bool(ai_response.get("correct", False)),
+            "explanation": ai_response.get("explanation", "")
+        }
+
+    def verify_batch(self, items):
+        system_prompt = (
+            "You are a correctness checker. You get a JSON list of items, each with an id, "
+            "a question, the letter the answer must start with, and the answer. "
+            "Judge every item. Respond in JSON format only:\n"
+            "{\"results\": [{\"id\": integer, \"correct\": boolean, \"explanation\": \"text\"}]}"
+        )
+        payload = [
+            {"id": i, "question": prompt, "letter": letter, "answer": answer_text}
+            for i, (prompt, letter, answer_text) in enumerate(items)
+        ]
+
+        ai_response = self._chat(system_prompt, json.dumps(payload))
+
+        verdicts = [None] * len(items)
+        for entry in ai_response.get("results", []) if isinstance(ai_response, dict) else []:
+            try:
+                idx = int(entry.get("id"))
+            except (TypeError, ValueError, AttributeError):
+                continue
+            if 0 <= idx < len(items):
+                verdicts[idx] = {
+                    "correct": bool(entry.get("correct", False)),
+                    "explanation": entry.get("explanation", "")
+                }
+        return verdicts
+
+    def _chat(self, system_prompt, user_prompt):
+        if chat is None:
+            raise VerifierError("ollama package is not installed")
+        try:
+            response: ChatResponse = chat(
+                model=self.model,
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": user_prompt}
+                ],
+                format="json",
+            )
+            return json.loads(response.message.content)
+        except Exception as e:
+            raise VerifierError(str(e))
+
+
+class LexiconVerifier(AnswerVerifier):
+    """
+    Accepts an answer when it appears in the curated answer list for the
+    prompt (games/data/blitz_lexicon.json, keyed by normalized prompt).
+    Prompts with no list are rejected, so only use it where that is acceptable.
+    """
+    cache_name = "lexicon"
+
+    def __init__(self, path=LEXICON_PATH):
+        self.path = path
+        self._lexicon = None
+
+    def verify(self, prompt, answer_text):
+        answers = self.answers_for(prompt)
+        if answers is None:
+            return {"correct": False, "explanation": "No answer list for this question"}
+        if normalize_text(answer_text) in answers:
+            return {"correct": True, "explanation": "Found in the answer list"}
+        return {"correct": False, "explanation": "Not in the answer list"}
+
+    def answers_for(self, prompt):
+        if self._lexicon is None:
+            self._lexicon = load_lexicon(self.path)
+        return self._lexicon.get(normalize_text(prompt))
+
+
+class FakeVerifier(AnswerVerifier):
+    """
+    Deterministic stand-in for load tests and CI boxes with no model.
+    Sleeps `latency` seconds per call and fails with probability
+    `error_rate` (from a seeded generator, so the same run fails the same
+    calls); otherwise every answer gets the `correct` verdict. Its verdicts
+    are never cached, so every check really pays the latency and error rate.
+    """
+    cache_name = "fake"
+    cacheable = False
+
+    def __init__(self, latency=0.0, error_rate=0.0, correct=True, seed=DEFAULT_FAKE_SEED):
+        self.latency = float(latency)
+        self.error_rate = float(error_rate)
+        self.correct = bool(correct)
+        self._random = random.Random(seed)
+
+    def verify(self, prompt, answer_text):
+        self._call()
+        return {"correct": self.correct, "explanation": "Fake verifier"}
+
+    def verify_batch(self, items):
+        # One simulated model call per batch, like the real backend
+        self._call()
+        return [{"correct": self.correct, "explanation": "Fake verifier"} for _ in items]
+
+    def _call(self):
+        if self.latency:
+            time.sleep(self.latency)
+        if self._random.random() < self.error_rate:
+            raise VerifierError("Injected fake verifier error")
+
+
+def load_lexicon(path=LEXICON_PATH):
+    """
+    Returns {normalized prompt: set of normalized answers}.
+    """
+    try:
+        with open(path, encoding="utf-8") as f:
+            raw = json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"Could not load lexicon {path}: {str(e)}")
+        return {}
+    return {normalize_text(p): {normalize_text(a) for a in answers} for p, answers in raw.items()}
+
+
+_known_answers = None
+
+def known_answers(prompt):
+    """
+    Normalized curated answers for a prompt from the shared lexicon, or None.
+    Used by the pre-filter whatever verifier backend is configured.
+    """
+    global _known_answers
+    if _known_answers is None:
+        _known_answers = load_lexicon()
+    return _known_answers.get(normalize_text(prompt))
+
+
+def build_verifier(name):
+    """
+    Builds a verifier from its config name: "ollama", "lexicon" or "fake".
+    Options come from app config (OLLAMA_MODEL, FAKE_VERIFIER_LATENCY,
+    FAKE_VERIFIER_ERROR_RATE, FAKE_VERIFIER_CORRECT, FAKE_VERIFIER_SEED).
+    """
+    config = current_app.config
+    if name == "ollama":
+        return OllamaVerifier(model=config.get("OLLAMA_MODEL", DEFAULT_OLLAMA_MODEL))
+    if name == "lexicon":
+        return LexiconVerifier()
+    if name == "fake":
+        return FakeVerifier(
+            latency=config.get("FAKE_VERIFIER_LATENCY", 0.0),
+            error_rate=config.get("FAKE_VERIFIER_ERROR_RATE", 0.0),
+            correct=config.get("FAKE_VERIFIER_CORRECT", True),
+            seed=config.get("FAKE_VERIFIER_SEED", DEFAULT_FAKE_SEED),
+        )
+    raise ValueError(f"Unknown answer verifier '{name}'")
+
+
+_verifiers = {}
+
+def get_verifier(game_type=None):
+    """
+    Verifier for a game type. ANSWER_VERIFIERS_BY_GAME_TYPE maps game types
+    to backend names; anything not listed uses ANSWER_VERIFIER (default "ollama").
+    Instances are built once per name and reused.
+    """
+    config = current_app.config
+    name = (config.get("ANSWER_VERIFIERS_BY_GAME_TYPE") or {}).get(game_type) \
+        or config.get("ANSWER_VERIFIER", "ollama")
+    if name not in _verifiers:
+        _verifiers[name] = build_verifier(name)
+    return _verifiers[name]
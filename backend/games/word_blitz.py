@@ -2,12 +2,19 @@ import random
 import string
 from datetime import datetime, timedelta
 from flask import Blueprint, request, jsonify
+from sqlalchemy import insert
 from setup.extensions import db
 from models import (
     Game, Player, Word_blitz as Word, 
     Question_blitz as Question, QuestionSet_blitz as QuestionSet,
     GameQuestionBlitz
 )
+from games.game_events import emit_to_game
+from games.game_clock import game_clock
+from games.bulk_answers import store_answers
+from games.question_catalog import question_catalog
+from games.answer_checker import ANSWER_POINTS
+from games.blitz_results import record_words, result_page, rebuild_results, needs_rebuild
 
 word_blitz_bp = Blueprint('word_blitz', __name__)
 
@@ -111,6 +118,8 @@ def join_game():
     db.session.add(new_player)
     db.session.commit()
 
+    emit_to_game(room, "player_joined", {"room": room, "username": username})
+
     return jsonify({"message": f"{username} joined game {room}"}), 200
 
 
@@ -144,41 +153,36 @@ def start_game():
     if game.started:
         return jsonify({"error": "Game already started"}), 400
 
+    # Pick a random question set from the in-memory catalog
+    questions = question_catalog.random_set()
+    if not questions:
+        return jsonify({"error": "No question sets available"}), 500
+
     # Mark as started, set the start time
     game.started = True
     game.start_time = datetime.utcnow()
-    db.session.commit()
-
-    # Pick a random question set
-    question_sets = QuestionSet.query.all()
-    if not question_sets:
-        return jsonify({"error": "No question sets available"}), 500
-
-    selected_set = random.choice(question_sets)
-    questions = Question.query.filter_by(question_set_id=selected_set.id).all()
 
     # For each question, assign a random letter
-    # Save in GameQuestionBlitz
-    for q in questions:
-        letter = random.choice(string.ascii_uppercase)
-        gqb = GameQuestionBlitz(
-            game_id=game.id,
-            question_id=q.id,
-            letter=letter
-        )
-        db.session.add(gqb)
-    db.session.commit()
-
-    # Return the assigned questions/letters
-    # We read them back from DB
+    # Save in GameQuestionBlitz with one bulk insert, everything in one commit
     assigned = []
-    for gqb in game.blitz_questions:
-        # "gqb.question" now works because we added a relationship in the model
+    for question_id, prompt in questions:
         assigned.append({
-            "question_id": gqb.question_id,
-            "prompt": gqb.question.prompt,
-            "letter": gqb.letter
+            "question_id": question_id,
+            "prompt": prompt,
+            "letter": random.choice(string.ascii_uppercase)
         })
+    db.session.execute(insert(GameQuestionBlitz), [
+        {"game_id": game.id, "question_id": a["question_id"], "letter": a["letter"]}
+        for a in assigned
+    ])
+    game_clock.schedule_round_end(game, game.start_time + timedelta(seconds=game.time_limit))
+    db.session.commit()
+
+    emit_to_game(room, "game_started", {
+        "room": room,
+        "questions": assigned,
+        "time_limit": game.time_limit
+    })
 
     return jsonify({
         "message": f"Game '{room}' started!",
@@ -202,13 +206,15 @@ def get_state():
         for gqb in game.blitz_questions:
             assigned.append({
                 "question_id": gqb.question_id,
-                "prompt": gqb.question.prompt,
+                "prompt": question_catalog.prompt(gqb.question_id),
                 "letter": gqb.letter
             })
 
     # Calculate time left
     time_left = None
-    if game.started and game.start_time:
+    if game.finished:
+        time_left = 0
+    elif game.started and game.start_time:
         elapsed = (datetime.utcnow() - game.start_time).total_seconds()
         remaining = game.time_limit - elapsed
         time_left = max(int(remaining), 0)
@@ -223,6 +229,7 @@ def get_state():
 
     return jsonify({
         "started": game.started,
+        "finished": bool(game.finished),
         "players": player_data,
         "questions": assigned,
         "time_left": time_left
@@ -255,9 +262,9 @@ def submit_answer():
     if not game.started:
         return jsonify({"error": "Game not started yet"}), 400
 
-    # Check time remaining
+    # Check time remaining (the game clock sets finished when the round ends)
     elapsed = (datetime.utcnow() - game.start_time).total_seconds() if game.start_time else 0
-    if elapsed > game.time_limit:
+    if game.finished or elapsed > game.time_limit:
         return jsonify({"error": "Time is up"}), 400
 
     # Check player
@@ -273,19 +280,6 @@ def submit_answer():
     # Validate if the word starts with the assigned letter
     if not submitted_word or submitted_word[0].upper() != gqb.letter.upper():
         return jsonify({"error": f"Answer must start with '{gqb.letter}'"}), 400
-    
-    letters = GameQuestionBlitz.query.filter_by(game_id=game.id, question_id=question_id).first()
-    if not letters:
-        return jsonify({"error": "Invalid question"}), 400
-    if letters.letter != submitted_word[0].upper():
-       print(f"Answer must start with '{letters.letter}'")
-       word_correct = True
-       player.score += 10
-    else:
-        word_correct = False
-        print(f"Answer is correct: '{submitted_word}'")
-    player.score =0
-    
 
     # Record the word in Word_blitz
     new_word = Word(
@@ -293,13 +287,28 @@ def submit_answer():
         game_id=game.id,
         username=username,
         question_id=question_id,
-        word_correct=word_correct
+        word_correct=True
     )
     db.session.add(new_word)
+    record_words([{
+        "game_id": game.id,
+        "username": username,
+        "question_id": question_id,
+        "word": submitted_word,
+        "word_correct": True
+    }])
 
     # Simple scoring: +10 points
+    player.score += ANSWER_POINTS
     db.session.commit()
 
+    emit_to_game(room, "answer_scored", {
+        "room": room,
+        "username": username,
+        "question_id": question_id,
+        "score": player.score
+    })
+
     return jsonify({"message": "Answer accepted", "new_score": player.score}), 200
 
 @word_blitz_bp.route("/submit_all", methods=["POST"])
@@ -340,7 +349,7 @@ def submit_all_answers():
 
         # Check if time limit is exceeded
         elapsed = (datetime.utcnow() - game.start_time).total_seconds() if game.start_time else 0
-        if elapsed > game.time_limit:
+        if game.finished or elapsed > game.time_limit:
             return jsonify({"error": "Time is up"}), 400
 
         # Verify player exists
@@ -348,38 +357,55 @@ def submit_all_answers():
         if not player:
             return jsonify({"error": "You are not in this game"}), 403
 
+        # One query for every letter assigned in this game
+        letters = dict(
+            db.session.query(GameQuestionBlitz.question_id, GameQuestionBlitz.letter)
+            .filter(GameQuestionBlitz.game_id == game.id)
+            .all()
+        )
+
         results = {}
+        new_rows = []
         for qid, word in answers.items():
-            #print(f"Processing: {qid} => {word}")
-            word = word.strip()
-
-            gqb = GameQuestionBlitz.query.filter_by(game_id=game.id, question_id=qid).first()
-            if not gqb:
+            word = (word or "").strip()
+            try:
+                letter = letters.get(int(qid))
+            except (TypeError, ValueError):
+                letter = None
+            if not letter:
                 results[qid] = {"word": word, "status": "❌ Invalid question"}
-                print(f"Invalid question: {qid}")
+                continue
+            if not word:
+                results[qid] = {"word": word, "status": "❌ No answer"}
                 continue
 
             # Validate word starts with the required letter
-            """if not word or word[0].upper() != gqb.letter.upper():
-                results[qid] = {"word": word, "status": f"❌ Must start with {gqb.letter}"}
-                print(f"Invalid word: {word}")
-                continue"""
-
-            # Save the valid answer
-            new_word = Word(
-                word=word,
-                game_id=game.id,
-                username=username,
-                question_id=qid
-            )
-            db.session.add(new_word)
-
-            # Update score
-            player.score += 10
-            results[qid] = {"word": word, "status": "✅ Accepted"}
-            #print(f"Accepted: {word}")
-
+            word_correct = word[0].upper() == letter.upper()
+            new_rows.append({
+                "word": word,
+                "game_id": game.id,
+                "username": username,
+                "question_id": int(qid),
+                "word_correct": word_correct
+            })
+            if word_correct:
+                results[qid] = {"word": word, "status": "✅ Accepted"}
+            else:
+                results[qid] = {"word": word, "status": f"❌ Must start with {letter}"}
+
+        # Points here are for the starting letter only; whether a word fits
+        # the category is scored separately by the answer checker
+        gained = ANSWER_POINTS * sum(1 for r in new_rows if r["word_correct"])
+        store_answers(Word, new_rows, player.id, gained)
+        record_words(new_rows)
         db.session.commit()
+
+        emit_to_game(room, "answer_scored", {
+            "room": room,
+            "username": username,
+            "question_ids": list(results),
+            "score": player.score
+        })
         return jsonify({"message": "All answers submitted!", "results": results, "score": player.score}), 200
 
     except Exception as e:
@@ -481,6 +507,7 @@ def add_questions():
             db.session.add(Question(prompt=prompt, question_set_id=new_set.id))
 
         db.session.commit()
+        question_catalog.load()
         return jsonify({"message": f"Custom question set '{set_name}' added!"}), 201
 
     except Exception as e:
@@ -527,6 +554,7 @@ def add_questions1():
             db.session.add(Question(prompt=prompt, question_set_id=new_set.id))
 
         db.session.commit()
+        question_catalog.load()
         return jsonify({"message": f"Custom question set '{set_name}' added!"}), 201
 
     except Exception as e:
@@ -611,107 +639,54 @@ def get_all_answers():
 @word_blitz_bp.route("/all_answers", methods=["GET"])
 def get_all_answers():
     """
-    Return all Word_blitz rows for a given game_id,
-    plus question prompt and the *latest* matching Answer row
-    (which has AI correctness, votes, etc.).
-    """
-    from sqlalchemy import and_, func
-    from models import Game, Word_blitz, Question_blitz, Answer, User
+    Return the results screen rows for a game: each player's word per
+    question, plus the latest Answer's AI verdict, votes and override.
+    Served from the word_blitz_result table, which is kept up to date as
+    words, checks, votes and overrides come in.
 
+    Expects:
+      GET /word_blitz/all_answers?game_id=123
+      optional paging: &limit=50&after=<id of the last row already shown>
+    Returns "next_after" to pass as after for the next page (null on the last one).
+    """
     game_id = request.args.get("game_id", type=int)
     if not game_id:
         return jsonify({"error": "Missing game_id"}), 400
 
+    limit = request.args.get("limit", type=int)
+    after_id = request.args.get("after", 0, type=int)
+    if limit is not None and limit < 1:
+        return jsonify({"error": "limit must be positive"}), 400
+
     game = Game.query.get(game_id)
     if not game:
         return jsonify({"error": f"Game {game_id} not found"}), 404
 
-    # Subquery: For each (game_id, question_id, user_id) in the Answer table,
-    # find the row with the largest "id".
-    latest_answers_subq = (
-        db.session.query(
-            Answer.game_id.label("sub_game_id"),
-            Answer.question_id.label("sub_question_id"),
-            Answer.user_id.label("sub_user_id"),
-            func.max(Answer.id).label("max_answer_id")
-        )
-        .group_by(Answer.game_id, Answer.question_id, Answer.user_id)
-        .subquery()
-    )
-
-    # Now join Word_blitz -> Question_blitz -> User -> subquery -> Answer
-    results_data = (
-        db.session.query(
-            Word_blitz,
-            Question_blitz,
-            Answer
-        )
-        .join(
-            Question_blitz,
-            Word_blitz.question_id == Question_blitz.id
-        )
-        .join(
-            User,
-            Word_blitz.username == User.username
-        )
-        # Join our subquery on (game_id, question_id, user_id)
-        .outerjoin(
-            latest_answers_subq,
-            and_(
-                Word_blitz.game_id == latest_answers_subq.c.sub_game_id,
-                Word_blitz.question_id == latest_answers_subq.c.sub_question_id,
-                User.id == latest_answers_subq.c.sub_user_id
-            )
-        )
-        # Then join the actual Answer table on Answer.id == subquery.max_answer_id
-        # (If subquery is None, a is None)
-        .outerjoin(
-            Answer,
-            Answer.id == latest_answers_subq.c.max_answer_id
-        )
-        .filter(Word_blitz.game_id == game_id)
-        .all()
-    )
+    rows, next_after = result_page(game_id, after_id, limit)
+    if not rows and not after_id and needs_rebuild(game_id):
+        # Game played before results were materialized
+        rebuild_results(game_id)
+        rows, next_after = result_page(game_id, after_id, limit)
 
     final = []
-    for (w, q, a) in results_data:
-        # 'a' might be None if there's no matching Answer
-        if a:
-            ai_correct = a.ai_correct
-            ai_result = a.ai_result
-            vote_requested = a.vote_requested
-            vote_yes = a.vote_yes
-            vote_no = a.vote_no
-            admin_override = a.admin_override
-            override_value = a.override_value
-            answer_id = a.id
-        else:
-            ai_correct = None
-            ai_result = None
-            vote_requested = False
-            vote_yes = 0
-            vote_no = 0
-            admin_override = False
-            override_value = None
-            answer_id = None
-
+    for r in rows:
         final.append({
-            "id": w.id,
-            "username": w.username,
-            "questionId": w.question_id,
-            "questionPrompt": q.prompt,
-            "word": w.word,
-            "word_correct": w.word_correct,
+            "id": r.id,
+            "username": r.username,
+            "questionId": r.question_id,
+            "questionPrompt": question_catalog.prompt(r.question_id),
+            "word": r.word,
+            "word_correct": r.word_correct,
 
             # The single "latest" Answer row for this user+question+game
-            "answerId": answer_id,
-            "aiCorrect": ai_correct,
-            "aiResult": ai_result,
-            "voteRequested": vote_requested,
-            "voteYes": vote_yes,
-            "voteNo": vote_no,
-            "adminOverride": admin_override,
-            "overrideValue": override_value,
+            "answerId": r.answer_id,
+            "aiCorrect": r.ai_correct,
+            "aiResult": r.ai_result,
+            "voteRequested": bool(r.vote_requested),
+            "voteYes": r.vote_yes or 0,
+            "voteNo": r.vote_no or 0,
+            "adminOverride": bool(r.admin_override),
+            "overrideValue": r.override_value,
         })
 
-    return jsonify({"answers": final}), 200
+    return jsonify({"answers": final, "next_after": next_after}), 200
@@ -1,14 +1,21 @@
 import traceback
-from flask import Blueprint, request, jsonify
+import click
+from flask import Blueprint, request, jsonify, current_app
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy.exc import IntegrityError
 from setup.extensions import db
 from models import Game, Player, Word, User
-from threading import Timer
+from datetime import datetime, timedelta
+from games.game_events import emit_to_game
+from games.game_clock import game_clock, round_time_left
+from games.chain_state import chain_states, normalize_word
+from games.word_dictionary import get_dictionary, build_dictionary, DEFAULT_DICTIONARY_PATH
 
 word_chain_bp = Blueprint('word_chain', __name__)
 
-# Keep track of active timers for the "start_timer" endpoint
-active_timers = {}
+
+def word_dictionary():
+    return get_dictionary(current_app.config.get("WORD_CHAIN_DICTIONARY") or DEFAULT_DICTIONARY_PATH)
 
 
 @word_chain_bp.route("/create", methods=["POST"])
@@ -39,19 +46,74 @@ def create_word_chain():
 @word_chain_bp.route("/get_state", methods=["GET"])
 def get_state():
     """
-    Returns the current game state (list of players and all submitted words).
+    Returns the current game state (list of players and the submitted words).
+    GET /word_chain/get_state?room=MyRoom                  (whole chain)
+    GET /word_chain/get_state?room=MyRoom&since_seq=42     (only words after seq 42)
+    "last_seq" is what to pass as since_seq next time. "length" is the number of
+    words in the chain; if it differs from what the client holds after applying
+    the new words, a word was vetoed and the client should fetch the whole chain.
     """
     room = request.args.get("room")
+    since_seq = request.args.get("since_seq", type=int)
     game = Game.query.filter_by(room=room, game_type="WordChain").first()
     if not game:
         return jsonify({"error": "Game not found"}), 404
 
     players = [p.username for p in game.players]
-    words = [w.word for w in Word.query.filter_by(game_id=game.id).order_by(Word.date_added.asc()).all()]
+
+    query = Word.query.filter(Word.game_id == game.id)
+    if since_seq is not None:
+        query = query.filter(Word.seq > since_seq)
+    words = query.order_by(Word.seq.asc(), Word.id.asc()).all()
+    state = chain_states.get(game)
+    # last_seq comes from the words actually returned, so a word committed
+    # while this request runs is picked up by the next poll rather than skipped
 
     return jsonify({
         "players": players,
-        "wordChain": words
+        "wordChain": [w.word for w in words],
+        "words": [{"seq": w.seq, "word": w.word, "username": w.username} for w in words],
+        "last_seq": words[-1].seq if words else (since_seq or 0),
+        "length": len(state.used),
+        "finished": bool(game.finished),
+        "time_left": round_time_left(game)
+    }), 200
+
+
+@word_chain_bp.route("/history", methods=["GET"])
+def get_history():
+    """
+    The chain one page at a time, oldest first.
+    GET /word_chain/history?room=MyRoom&limit=50&after_seq=0
+    Returns "next_after_seq" to pass as after_seq for the next page (null on the last one).
+    """
+    room = request.args.get("room")
+    after_seq = request.args.get("after_seq", 0, type=int)
+    limit = min(request.args.get("limit", 50, type=int), 500)
+    if limit < 1:
+        return jsonify({"error": "limit must be positive"}), 400
+
+    game = Game.query.filter_by(room=room, game_type="WordChain").first()
+    if not game:
+        return jsonify({"error": "Game not found"}), 404
+
+    words = (
+        Word.query.filter(Word.game_id == game.id, Word.seq > after_seq)
+        .order_by(Word.seq.asc())
+        .limit(limit + 1)
+        .all()
+    )
+    next_after_seq = None
+    if len(words) > limit:
+        words = words[:limit]
+        next_after_seq = words[-1].seq
+
+    return jsonify({
+        "words": [
+            {"seq": w.seq, "word": w.word, "username": w.username, "date_added": w.date_added}
+            for w in words
+        ],
+        "next_after_seq": next_after_seq
     }), 200
 
 
@@ -74,6 +136,7 @@ def join_word_chain():
         db.session.commit()
 
         players = [p.username for p in game.players]
+        emit_to_game(room, "player_joined", {"room": room, "username": username})
         return jsonify({"message": f"{username} joined {room}", "players": players}), 200
 
     except Exception as e:
@@ -100,22 +163,54 @@ def submit_word_chain():
         if not game:
             return jsonify({"error": "Room does not exist"}), 404
 
-        # Check chain rule
-        last_word_obj = Word.query.filter_by(game_id=game.id).order_by(Word.date_added.desc()).first()
-        if last_word_obj and last_word_obj.word[-1].lower() != word[0].lower():
-            return jsonify({"error": "Word does not follow the chain rule"}), 400
-
-        # Check for repeats
-        existing_same_word = Word.query.filter_by(game_id=game.id, word=word).first()
-        if existing_same_word:
-            return jsonify({"error": "That word was already used before!"}), 400
-
-        # If all good, add the new word
-        new_word = Word(word=word, game_id=game.id, username=username)
-        db.session.add(new_word)
-        db.session.commit()
-
-        return jsonify({"message": "Word accepted", "word": word, "username": username}), 200
+        if game.finished:
+            return jsonify({"error": "Time is up"}), 400
+
+        word_norm = normalize_word(word)
+        if not word_norm:
+            return jsonify({"error": "Word is empty"}), 400
+
+        dictionary = word_dictionary()
+        if dictionary is not None and word_norm not in dictionary:
+            return jsonify({"error": f"'{word}' is not in the dictionary"}), 400
+
+        # Validate against the cached chain state (no queries), then claim the
+        # next seq with a compare-and-swap on Game.chain_seq so two racing
+        # submissions can't both extend the chain. If another worker got there
+        # first, reload the chain and validate again.
+        for attempt in range(2):
+            state = chain_states.get(game)
+            with state.lock:
+                error = state.check(word_norm)
+                if error:
+                    return jsonify({"error": error}), 400
+
+                seq = state.seq + 1
+                claimed = Game.query.filter_by(id=game.id, chain_seq=state.seq).update(
+                    {Game.chain_seq: seq}, synchronize_session=False
+                )
+                if not claimed:
+                    db.session.rollback()
+                    chain_states.invalidate(game.id)
+                    continue
+
+                new_word = Word(word=word, word_norm=word_norm, seq=seq, game_id=game.id, username=username)
+                db.session.add(new_word)
+                try:
+                    db.session.commit()
+                except IntegrityError:
+                    # uniq_chain_word: the same word went in through another worker
+                    db.session.rollback()
+                    chain_states.invalidate(game.id)
+                    return jsonify({"error": "That word was already used before!"}), 400
+                state.append(word_norm, seq)
+                break
+        else:
+            return jsonify({"error": "The chain changed, please try again"}), 409
+
+        emit_to_game(room, "word_added", {"room": room, "word": word, "username": username, "seq": seq})
+
+        return jsonify({"message": "Word accepted", "word": word, "username": username, "seq": seq}), 200
 
     except Exception as e:
         print(f"Error in submit_word_chain: {e}")
@@ -154,6 +249,7 @@ def kick_player():
 
         # Return the updated list
         players = [p.username for p in game.players]
+        emit_to_game(room, "player_left", {"room": room, "username": player_to_kick})
         return jsonify({"message": f"Player '{player_to_kick}' was kicked out", "players": players}), 200
 
     except Exception as e:
@@ -182,19 +278,15 @@ def start_timer():
         if not admin or admin.username != admin_username:
             return jsonify({"error": "Only the admin can start the timer"}), 403
 
-        # If a timer is already running, cancel it
-        if room in active_timers:
-            active_timers[room].cancel()
-
-        # Timer expiration callback
-        def timer_expired():
-            del active_timers[room]  # Remove from active timers
-            print(f"Time's up for {room}!")  # Or handle end-of-round logic
+        # (Re)start the round; a timer already running for the room is replaced
+        game.started = True
+        game.finished = False
+        game.start_time = datetime.utcnow()
+        game.time_limit = duration
+        game_clock.schedule_round_end(game, game.start_time + timedelta(seconds=duration))
+        db.session.commit()
 
-        # Start a new timer
-        timer = Timer(duration, timer_expired)
-        timer.start()
-        active_timers[room] = timer
+        emit_to_game(room, "timer_started", {"room": room, "duration": duration})
 
         return jsonify({"message": f"Timer started for {duration} seconds"}), 200
 
@@ -233,18 +325,71 @@ def veto_word():
 
 
         # Check if the word is in the chain
-        w = Word.query.filter_by(game_id=game.id, word=word_to_veto).first()
+        w = Word.query.filter_by(game_id=game.id, word_norm=normalize_word(word_to_veto)).first()
         if not w:
             print(f"Word '{word_to_veto}' not found in game {room}")
             return jsonify({"error": f"Word '{word_to_veto}' not found in the game"}), 404
 
-        # Remove it
+        # Remove it, and bump chain_seq in the same commit so every worker's
+        # cached chain stops matching Game.chain_seq and gets reloaded
         db.session.delete(w)
+        Game.query.filter_by(id=game.id).update(
+            {Game.chain_seq: Game.chain_seq + 1}, synchronize_session=False
+        )
         db.session.commit()
+        chain_states.invalidate(game.id)
+
+        emit_to_game(room, "word_vetoed", {"room": room, "word": word_to_veto})
 
         return jsonify({"message": f"Word '{word_to_veto}' was vetoed"}), 200
 
     except Exception as e:
         print(f"Error in veto_word: {e}")
         traceback.print_exc()
-        return jsonify({"error": "Server error"}), 500
\ No newline at end of file
+        return jsonify({"error": "Server error"}), 500
+
+
+@word_chain_bp.route("/next_words", methods=["GET"])
+def next_words():
+    """
+    How many dictionary words are still available to extend the chain,
+    per starting letter (dictionary words minus the ones already used here).
+    GET /word_chain/next_words?room=MyRoom
+    {
+      "letter": "e",                  (the letter the next word must start with, null for an empty chain)
+      "remaining": 1234,              (count for that letter)
+      "counts": {"a": 5012, ...}
+    }
+    """
+    room = request.args.get("room")
+    game = Game.query.filter_by(room=room, game_type="WordChain").first()
+    if not game:
+        return jsonify({"error": "Game not found"}), 404
+
+    dictionary = word_dictionary()
+    if dictionary is None:
+        return jsonify({"error": "No dictionary installed"}), 503
+
+    state = chain_states.get(game)
+    counts = {
+        letter: max(total - state.used_by_letter[letter], 0)
+        for letter, total in dictionary.letter_counts().items()
+    }
+    return jsonify({
+        "letter": state.last_letter,
+        "remaining": counts.get(state.last_letter) if state.last_letter else sum(counts.values()),
+        "counts": counts
+    }), 200
+
+
+@word_chain_bp.cli.command("build-dictionary")
+@click.argument("source")
+@click.option("--out", default=None, help="Output file, defaults to WORD_CHAIN_DICTIONARY or games/data/wordchain_words.dict.")
+def build_dictionary_command(source, out):
+    """
+    Build the word chain dictionary from a word list with one word per line, e.g.
+    flask --app app word_chain build-dictionary /usr/share/dict/words
+    """
+    out = out or current_app.config.get("WORD_CHAIN_DICTIONARY") or DEFAULT_DICTIONARY_PATH
+    count = build_dictionary(source, out)
+    print(f"Wrote {count} words to {out}")
@@ -0,0 +1,133 @@
+import mmap
+import os
+import re
+import string
+import struct
+import threading
+import unicodedata
+
+DEFAULT_DICTIONARY_PATH = os.path.join(os.path.dirname(__file__), "data", "wordchain_words.dict")
+
+# File layout: a 16 byte header (magic, record width, record count) followed by
+# `count` fixed-width records, each one lowercase a-z word padded with NUL bytes,
+# sorted. Fixed width means record i sits at HEADER_SIZE + i * width, so a lookup
+# is a binary search straight over the mapped file and counting the words with a
+# given prefix is just the distance between two search results.
+MAGIC = b"WCDICT1\x00"
+HEADER = struct.Struct("<8sII")
+HEADER_SIZE = HEADER.size
+MAX_WORD_LENGTH = 32
+
+
+def fold_word(word):
+    """
+    Dictionary form of a word: accents folded, lowercase, a-z only.
+    Returns None for anything else (spaces, digits, hyphens).
+    """
+    word = unicodedata.normalize("NFKD", (word or "").strip())
+    word = "".join(c for c in word if not unicodedata.combining(c)).lower()
+    return word if re.fullmatch(r"[a-z]+", word) else None
+
+
+class WordDictionary:
+    """
+    Read-only word list backed by an mmap of a file built by
+    build_dictionary(). Opening it reads nothing but the header, and every
+    worker process that maps the same file shares its pages through the OS
+    page cache instead of holding its own copy.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.width, self.count = HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC:
+            self._mm.close()
+            raise ValueError(f"{path} is not a word chain dictionary")
+
+    def __contains__(self, word):
+        folded = fold_word(word)
+        if not folded or len(folded) > self.width:
+            return False
+        key = folded.encode("ascii")
+        i = self._lower_bound(key)
+        return i < self.count and self._record(i) == key
+
+    def __len__(self):
+        return self.count
+
+    def count_prefix(self, prefix):
+        """
+        How many dictionary words start with prefix.
+        """
+        prefix = prefix.lower().encode("ascii")
+        # every word with the prefix sorts between prefix and prefix + "\xff"
+        return self._lower_bound(prefix + b"\xff") - self._lower_bound(prefix)
+
+    def letter_counts(self):
+        return {letter: self.count_prefix(letter) for letter in string.ascii_lowercase}
+
+    def close(self):
+        self._mm.close()
+
+    def _record(self, i):
+        start = HEADER_SIZE + i * self.width
+        return self._mm[start:start + self.width].rstrip(b"\x00")
+
+    def _lower_bound(self, key):
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._record(mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+
+def build_dictionary(source_path, out_path=DEFAULT_DICTIONARY_PATH):
+    """
+    Builds the dictionary file from a plain word list (one word per line,
+    e.g. /usr/share/dict/words). Words that do not fold to a-z, or are longer
+    than MAX_WORD_LENGTH, are skipped. Returns the number of words written.
+    """
+    words = set()
+    with open(source_path, encoding="utf-8", errors="ignore") as f:
+        for line in f:
+            folded = fold_word(line)
+            if folded and len(folded) <= MAX_WORD_LENGTH:
+                words.add(folded)
+    words = sorted(words)
+    width = max((len(w) for w in words), default=1)
+
+    tmp_path = out_path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, width, len(words)))
+        for w in words:
+            f.write(w.encode("ascii").ljust(width, b"\x00"))
+    os.replace(tmp_path, out_path)  # workers that already mapped the old file keep it
+    return len(words)
+
+
+_dictionary = None
+_dictionary_lock = threading.Lock()
+_missing_reported = False
+
+
+def get_dictionary(path=DEFAULT_DICTIONARY_PATH):
+    """
+    The shared WordDictionary, opened on first use, or None when the file
+    has not been built (word chain then only checks the chain rules).
+    """
+    global _dictionary, _missing_reported
+    if _dictionary is None:
+        with _dictionary_lock:
+            if _dictionary is None:
+                if not os.path.exists(path):
+                    if not _missing_reported:
+                        print(f"Word chain dictionary {path} not found, words are not dictionary-checked")
+                        _missing_reported = True
+                    return None
+                _dictionary = WordDictionary(path)
+    return _dictionary
@@ -0,0 +1,180 @@
+"""add game, chat and answer checker schema
+
+Brings a database created by db.create_all() from the original models up
+to date: the new columns, constraints and indexes on existing tables, the
+new tables, and the pair key on existing direct chats. Every step checks
+what is already there, so a database created from the current models just
+gets stamped.
+
+Revision ID: 3f2b9c1d7e4a
+Revises:
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3f2b9c1d7e4a'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+    tables = set(inspector.get_table_names())
+
+    def columns(table):
+        return {c['name'] for c in inspector.get_columns(table)}
+
+    def uniques(table):
+        return {u['name'] for u in inspector.get_unique_constraints(table)}
+
+    def indexes(table):
+        return {i['name'] for i in inspector.get_indexes(table)}
+
+    game_columns = columns('game')
+    with op.batch_alter_table('game') as batch_op:
+        if 'finished' not in game_columns:
+            batch_op.add_column(sa.Column('finished', sa.Boolean(), nullable=True))
+        if 'chain_seq' not in game_columns:
+            batch_op.add_column(sa.Column('chain_seq', sa.Integer(), server_default='0', nullable=False))
+        if 'state_version' not in game_columns:
+            batch_op.add_column(sa.Column('state_version', sa.Integer(), server_default='0', nullable=False))
+
+    # Existing words keep word_norm/seq NULL: the chain state falls back to
+    # the word itself, and NULLs never collide in the unique constraints
+    word_columns, word_uniques = columns('word'), uniques('word')
+    with op.batch_alter_table('word') as batch_op:
+        if 'word_norm' not in word_columns:
+            batch_op.add_column(sa.Column('word_norm', sa.String(), nullable=True))
+        if 'seq' not in word_columns:
+            batch_op.add_column(sa.Column('seq', sa.Integer(), nullable=True))
+        if 'uniq_chain_word' not in word_uniques:
+            batch_op.create_unique_constraint('uniq_chain_word', ['game_id', 'word_norm'])
+        if 'uniq_chain_seq' not in word_uniques:
+            batch_op.create_unique_constraint('uniq_chain_seq', ['game_id', 'seq'])
+
+    chat_columns, chat_uniques = columns('chat'), uniques('chat')
+    with op.batch_alter_table('chat') as batch_op:
+        if 'user_low_id' not in chat_columns:
+            batch_op.add_column(sa.Column('user_low_id', sa.Integer(), nullable=True))
+            batch_op.create_foreign_key('fk_chat_user_low_id_user', 'user', ['user_low_id'], ['id'])
+        if 'user_high_id' not in chat_columns:
+            batch_op.add_column(sa.Column('user_high_id', sa.Integer(), nullable=True))
+            batch_op.create_foreign_key('fk_chat_user_high_id_user', 'user', ['user_high_id'], ['id'])
+        if 'uniq_chat_pair' not in chat_uniques:
+            batch_op.create_unique_constraint('uniq_chat_pair', ['user_low_id', 'user_high_id'])
+
+    participant_columns = columns('chat_participant')
+    with op.batch_alter_table('chat_participant') as batch_op:
+        if 'unread_count' not in participant_columns:
+            batch_op.add_column(sa.Column('unread_count', sa.Integer(), server_default='0', nullable=False))
+        if 'last_read_message_id' not in participant_columns:
+            batch_op.add_column(sa.Column('last_read_message_id', sa.Integer(), server_default='0', nullable=False))
+    if 'ix_chat_participant_chat_user' not in indexes('chat_participant'):
+        op.create_index('ix_chat_participant_chat_user', 'chat_participant', ['chat_id', 'user_id'])
+
+    if 'ix_message_chat_id' not in indexes('message'):
+        op.create_index('ix_message_chat_id', 'message', ['chat_id', 'id'])
+
+    if 'answer_verdict_cache' not in tables:
+        op.create_table(
+            'answer_verdict_cache',
+            sa.Column('id', sa.Integer(), primary_key=True),
+            sa.Column('cache_key', sa.String(length=64), nullable=False, unique=True),
+            sa.Column('model_name', sa.String(), nullable=False),
+            sa.Column('prompt_norm', sa.String(), nullable=False),
+            sa.Column('answer_norm', sa.String(), nullable=False),
+            sa.Column('correct', sa.Boolean(), nullable=False),
+            sa.Column('explanation', sa.Text(), nullable=True),
+            sa.Column('date_created', sa.DateTime(), nullable=True),
+        )
+        op.create_index('ix_verdict_prompt_answer', 'answer_verdict_cache', ['prompt_norm', 'answer_norm'])
+
+    if 'word_blitz_result' not in tables:
+        op.create_table(
+            'word_blitz_result',
+            sa.Column('id', sa.Integer(), primary_key=True),
+            sa.Column('game_id', sa.Integer(), sa.ForeignKey('game.id'), nullable=False),
+            sa.Column('username', sa.String(), nullable=False),
+            sa.Column('question_id', sa.Integer(), sa.ForeignKey('question_blitz.id'), nullable=False),
+            sa.Column('word', sa.String(), nullable=False),
+            sa.Column('word_correct', sa.Boolean(), nullable=True),
+            sa.Column('answer_id', sa.Integer(), sa.ForeignKey('answer.id'), nullable=True),
+            sa.Column('ai_correct', sa.Boolean(), nullable=True),
+            sa.Column('ai_result', sa.Text(), nullable=True),
+            sa.Column('vote_requested', sa.Boolean(), nullable=True),
+            sa.Column('vote_yes', sa.Integer(), nullable=True),
+            sa.Column('vote_no', sa.Integer(), nullable=True),
+            sa.Column('admin_override', sa.Boolean(), nullable=True),
+            sa.Column('override_value', sa.Boolean(), nullable=True),
+            sa.UniqueConstraint('game_id', 'question_id', 'username', name='uniq_blitz_result'),
+        )
+
+    if 'game_deadline' not in tables:
+        op.create_table(
+            'game_deadline',
+            sa.Column('id', sa.Integer(), primary_key=True),
+            sa.Column('room', sa.String(), nullable=False, unique=True),
+            sa.Column('game_id', sa.Integer(), sa.ForeignKey('game.id'), nullable=False),
+            sa.Column('ends_at', sa.DateTime(), nullable=False),
+            sa.Column('fired', sa.Boolean(), nullable=False),
+        )
+        op.create_index('ix_game_deadline_pending', 'game_deadline', ['fired', 'ends_at'])
+
+    backfill_pair_keys()
+
+
+def backfill_pair_keys():
+    """
+    Sets the pair key on chats created before Chat had one: every chat with
+    exactly two participants, the oldest chat winning when a pair has
+    several (later ones stay without a key, like group chats).
+    """
+    bind = op.get_bind()
+    taken = set(bind.execute(sa.text(
+        "SELECT user_low_id, user_high_id FROM chat WHERE user_low_id IS NOT NULL"
+    )).all())
+    rows = bind.execute(sa.text(
+        "SELECT p.chat_id, MIN(p.user_id), MAX(p.user_id) FROM chat_participant p "
+        "JOIN chat c ON c.id = p.chat_id WHERE c.user_low_id IS NULL "
+        "GROUP BY p.chat_id HAVING COUNT(DISTINCT p.user_id) = 2 ORDER BY p.chat_id"
+    )).all()
+    updates = []
+    for chat_id, low, high in rows:
+        if (low, high) not in taken:
+            taken.add((low, high))
+            updates.append({"id": chat_id, "low": low, "high": high})
+    if updates:
+        bind.execute(sa.text("UPDATE chat SET user_low_id = :low, user_high_id = :high WHERE id = :id"), updates)
+
+
+def downgrade():
+    op.drop_table('game_deadline')
+    op.drop_table('word_blitz_result')
+    op.drop_table('answer_verdict_cache')
+
+    op.drop_index('ix_message_chat_id', table_name='message')
+    op.drop_index('ix_chat_participant_chat_user', table_name='chat_participant')
+    with op.batch_alter_table('chat_participant') as batch_op:
+        batch_op.drop_column('last_read_message_id')
+        batch_op.drop_column('unread_count')
+
+    with op.batch_alter_table('chat') as batch_op:
+        batch_op.drop_constraint('uniq_chat_pair', type_='unique')
+        batch_op.drop_column('user_high_id')
+        batch_op.drop_column('user_low_id')
+
+    with op.batch_alter_table('word') as batch_op:
+        batch_op.drop_constraint('uniq_chain_seq', type_='unique')
+        batch_op.drop_constraint('uniq_chain_word', type_='unique')
+        batch_op.drop_column('seq')
+        batch_op.drop_column('word_norm')
+
+    with op.batch_alter_table('game') as batch_op:
+        batch_op.drop_column('state_version')
+        batch_op.drop_column('chain_seq')
+        batch_op.drop_column('finished')
@@ -33,6 +33,9 @@ class Game(db.Model):
     started = db.Column(db.Boolean, default=False)
     time_limit = db.Column(db.Integer, default=60)
     start_time = db.Column(db.DateTime, nullable=True)
+    finished = db.Column(db.Boolean, default=False)  # set by the game clock, closes submissions
+    chain_seq = db.Column(db.Integer, default=0, server_default='0', nullable=False)  # WordChain: seq of the last accepted word
+    state_version = db.Column(db.Integer, default=0, server_default='0', nullable=False)  # LetterMatch: bumped on every change get_state shows
 
 class Player(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -51,8 +54,15 @@ class Word(db.Model):
     game_id = db.Column(db.Integer, db.ForeignKey('game.id'), nullable=False)
     username = db.Column(db.String, nullable=False)  # Allows non-registered players
     date_added = db.Column(db.DateTime, default=datetime.utcnow)
+    word_norm = db.Column(db.String, nullable=True)  # lowercased/trimmed, what repeats are checked on
+    seq = db.Column(db.Integer, nullable=True)  # position in the chain, from Game.chain_seq
     #question_id = db.Column(db.Integer, db.ForeignKey('question_blitz.id'), nullable=False)
 
+    __table_args__ = (
+        db.UniqueConstraint('game_id', 'word_norm', name='uniq_chain_word'),
+        db.UniqueConstraint('game_id', 'seq', name='uniq_chain_seq'),
+    )
+
 
 class QuestionSet_blitz(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -86,12 +96,25 @@ class GameQuestionBlitz(db.Model):
 
 class Chat(db.Model):
     id = db.Column(db.Integer, primary_key=True)
+    # Direct-message pair key, smaller user id first (see chat.pair_key)
+    user_low_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=True)
+    user_high_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=True)
+
+    __table_args__ = (
+        db.UniqueConstraint('user_low_id', 'user_high_id', name='uniq_chat_pair'),
+    )
 
 class ChatParticipant(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     chat_id = db.Column(db.Integer, db.ForeignKey('chat.id'), nullable=False)
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
     chat_active = db.Column(db.Boolean, default=False)
+    unread_count = db.Column(db.Integer, default=0, server_default='0', nullable=False)  # messages from others since last_read_message_id
+    last_read_message_id = db.Column(db.Integer, default=0, server_default='0', nullable=False)  # read watermark
+
+    __table_args__ = (
+        db.Index('ix_chat_participant_chat_user', 'chat_id', 'user_id'),
+    )
 
 class Message(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -100,6 +123,10 @@ class Message(db.Model):
     message_body = db.Column(db.String, nullable=False)
     read = db.Column(db.Boolean, default=False)
 
+    __table_args__ = (
+        db.Index('ix_message_chat_id', 'chat_id', 'id'),  # history pages and last message per chat
+    )
+
 class Answer(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     game_id = db.Column(db.Integer, db.ForeignKey('game.id'), nullable=False)
@@ -158,6 +185,7 @@ class game_question_lettermatch(db.Model):
 
     # Relationship to question_lettermatch
     question = db.relationship("question_LetterMatch", backref="game_questions", lazy=True)
+    game = db.relationship("Game", backref=db.backref("letter_match_questions", lazy=True))
         
 #answers provided by players
 class playerAnswer_LetterMatch(db.Model):
@@ -184,3 +212,63 @@ class letterMatch_answers(db.Model):
 
     # Relationship to question_lettermatch
     question = db.relationship("question_LetterMatch", backref="correct_answers", lazy=True)
+
+
+#answer checker tables ------------------------------------------------
+
+#cached AI verdicts, keyed on normalized prompt + answer + model name
+class AnswerVerdictCache(db.Model):
+    __tablename__ = 'answer_verdict_cache'
+    id = db.Column(db.Integer, primary_key=True)
+    cache_key = db.Column(db.String(64), unique=True, nullable=False)  # sha256 of model/prompt/answer
+    model_name = db.Column(db.String, nullable=False)
+    prompt_norm = db.Column(db.String, nullable=False)
+    answer_norm = db.Column(db.String, nullable=False)
+    correct = db.Column(db.Boolean, nullable=False)
+    explanation = db.Column(db.Text, nullable=True)
+    date_created = db.Column(db.DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        db.Index('ix_verdict_prompt_answer', 'prompt_norm', 'answer_norm'),
+    )
+
+#results screen rows, one per player/question in a game, kept in sync with
+#Word_blitz and the latest Answer so /word_blitz/all_answers is a single-table read
+class WordBlitzResult(db.Model):
+    __tablename__ = 'word_blitz_result'
+    id = db.Column(db.Integer, primary_key=True)
+    game_id = db.Column(db.Integer, db.ForeignKey('game.id'), nullable=False)
+    username = db.Column(db.String, nullable=False)
+    question_id = db.Column(db.Integer, db.ForeignKey('question_blitz.id'), nullable=False)
+    word = db.Column(db.String, nullable=False)
+    word_correct = db.Column(db.Boolean, default=False)
+
+    # copied from the latest Answer row for this player/question, if any
+    answer_id = db.Column(db.Integer, db.ForeignKey('answer.id'), nullable=True)
+    ai_correct = db.Column(db.Boolean, default=None)
+    ai_result = db.Column(db.Text, nullable=True)
+    vote_requested = db.Column(db.Boolean, default=False)
+    vote_yes = db.Column(db.Integer, default=0)
+    vote_no = db.Column(db.Integer, default=0)
+    admin_override = db.Column(db.Boolean, default=False)
+    override_value = db.Column(db.Boolean, default=None)
+
+    __table_args__ = (
+        db.UniqueConstraint('game_id', 'question_id', 'username', name='uniq_blitz_result'),
+    )
+
+
+#game clock tables ----------------------------------------------------
+
+#one pending round end per room, so the game clock can pick them back up after a restart
+class GameDeadline(db.Model):
+    __tablename__ = 'game_deadline'
+    id = db.Column(db.Integer, primary_key=True)
+    room = db.Column(db.String, unique=True, nullable=False)
+    game_id = db.Column(db.Integer, db.ForeignKey('game.id'), nullable=False)
+    ends_at = db.Column(db.DateTime, nullable=False)
+    fired = db.Column(db.Boolean, default=False, nullable=False)
+
+    __table_args__ = (
+        db.Index('ix_game_deadline_pending', 'fired', 'ends_at'),
+    )
@@ -0,0 +1,303 @@
+import threading
+import time
+from abc import ABC, abstractmethod
+from utils.lru import LRUCache
+
+try:
+    import redis
+except ImportError:  # only needed for a redis:// PRESENCE_URL
+    redis = None
+
+REDIS_PREFIX = "lettermatch:presence:"
+# A sid that has not pinged for this long is treated as gone (missed disconnect, dead worker)
+DEFAULT_IDLE_TIMEOUT = 180
+# Last-seen times kept for at most this many users, oldest dropped first
+DEFAULT_MAX_USERS = 100000
+# How often add()/touch() sweep out idle sids
+SWEEP_INTERVAL = 30
+
+
+def user_room(username):
+    """
+    SocketIO room every connection of a user joins. Emitting to it reaches
+    all of that user's tabs and devices, whichever worker they are on.
+    """
+    return f"user:{username}"
+
+
+class PresenceRegistry(ABC):
+    """
+    Which socket ids each user has connected: add() when a connection
+    identifies itself (join_chat_rooms), touch() on its heartbeat, remove()
+    on disconnect. A user is online while they have at least one sid.
+
+    Every call records the user's last-seen time. Sids idle for longer than
+    idle_timeout are evicted, so a disconnect that never arrived does not
+    keep a user online forever, and last-seen times are kept for at most
+    max_users users.
+    """
+
+    def __init__(self, idle_timeout=DEFAULT_IDLE_TIMEOUT, max_users=DEFAULT_MAX_USERS):
+        self.idle_timeout = idle_timeout
+        self.max_users = max_users
+        self._next_sweep = 0
+
+    @abstractmethod
+    def add(self, username, sid):
+        ...
+
+    @abstractmethod
+    def touch(self, sid):
+        """
+        Marks a sid as alive. Returns False when the sid is unknown (e.g.
+        already evicted), the connection should then identify itself again.
+        """
+        ...
+
+    @abstractmethod
+    def remove(self, sid):
+        """
+        Forgets a sid. Returns the username it belonged to, or None.
+        """
+        ...
+
+    @abstractmethod
+    def sids(self, username):
+        ...
+
+    @abstractmethod
+    def last_seen(self, usernames):
+        """
+        username -> unix time the user was last connected, for the users
+        that have been seen.
+        """
+        ...
+
+    @abstractmethod
+    def evict_idle(self, now=None):
+        """
+        Removes every sid idle for longer than idle_timeout.
+        Returns the number of sids removed.
+        """
+        ...
+
+    def is_online(self, username):
+        return bool(self.sids(username))
+
+    def online(self, usernames):
+        return {username for username in usernames if self.is_online(username)}
+
+    def _maybe_sweep(self, now):
+        if now >= self._next_sweep:
+            self._next_sweep = now + SWEEP_INTERVAL
+            self.evict_idle(now)
+
+
+class MemoryPresence(PresenceRegistry):
+    """
+    Registry held in this process, enough for a single worker. Sids and
+    users are kept in LRUCaches in the order they were last seen, so
+    evicting only ever looks at the entries that actually expire.
+    """
+
+    def __init__(self, idle_timeout=DEFAULT_IDLE_TIMEOUT, max_users=DEFAULT_MAX_USERS):
+        super().__init__(idle_timeout, max_users)
+        self._sids_by_user = {}
+        self._user_by_sid = {}
+        self._sid_seen = LRUCache()
+        self._last_seen = LRUCache(max_users)
+        self._lock = threading.RLock()
+
+    def add(self, username, sid):
+        now = time.time()
+        with self._lock:
+            previous = self._user_by_sid.get(sid)
+            if previous is not None and previous != username:
+                self._discard(previous, sid)
+            self._user_by_sid[sid] = username
+            self._sids_by_user.setdefault(username, set()).add(sid)
+            self._seen(sid, username, now)
+            self._maybe_sweep(now)
+
+    def touch(self, sid):
+        now = time.time()
+        with self._lock:
+            username = self._user_by_sid.get(sid)
+            if username is not None:
+                self._seen(sid, username, now)
+            self._maybe_sweep(now)
+            return username is not None
+
+    def remove(self, sid):
+        with self._lock:
+            username = self._user_by_sid.pop(sid, None)
+            self._sid_seen.pop(sid, None)
+            if username is not None:
+                self._discard(username, sid)
+                self._last_seen.put(username, time.time())
+            return username
+
+    def sids(self, username):
+        with self._lock:
+            return set(self._sids_by_user.get(username, ()))
+
+    def last_seen(self, usernames):
+        with self._lock:
+            seen = {u: self._last_seen.peek(u) for u in usernames}
+            return {u: t for u, t in seen.items() if t is not None}
+
+    def evict_idle(self, now=None):
+        cutoff = (now or time.time()) - self.idle_timeout
+        evicted = 0
+        with self._lock:
+            while True:
+                oldest = self._sid_seen.oldest()
+                if oldest is None or oldest[1] > cutoff:
+                    break
+                sid = oldest[0]
+                self._sid_seen.pop(sid)
+                username = self._user_by_sid.pop(sid, None)
+                if username is not None:
+                    self._discard(username, sid)
+                evicted += 1
+        return evicted
+
+    def _seen(self, sid, username, now):
+        self._sid_seen.put(sid, now)
+        self._last_seen.put(username, now)
+
+    def _discard(self, username, sid):
+        sids = self._sids_by_user.get(username)
+        if sids is not None:
+            sids.discard(sid)
+            if not sids:
+                del self._sids_by_user[username]
+
+
+class RedisPresence(PresenceRegistry):
+    """
+    Registry shared by every worker through a Redis-protocol server: one set
+    of sids per user, a sid -> username hash for disconnects, and two sorted
+    sets scored by time (sid activity, user last seen) for eviction; the
+    last-seen set is trimmed to max_users on each sweep. Takes a url, or an
+    already built client (e.g. a local stand-in server's).
+    """
+
+    def __init__(self, url=None, client=None, prefix=REDIS_PREFIX,
+                 idle_timeout=DEFAULT_IDLE_TIMEOUT, max_users=DEFAULT_MAX_USERS):
+        super().__init__(idle_timeout, max_users)
+        if client is None:
+            if redis is None:
+                raise RuntimeError("The redis package is needed for a redis:// PRESENCE_URL")
+            client = redis.Redis.from_url(url, decode_responses=True)
+        self.client = client
+        self.prefix = prefix
+        self.sid_key = prefix + "sid"
+        self.sid_seen_key = prefix + "sid_seen"
+        self.last_seen_key = prefix + "last_seen"
+
+    def user_key(self, username):
+        return f"{self.prefix}user:{username}"
+
+    def add(self, username, sid):
+        now = time.time()
+        previous = self.client.hget(self.sid_key, sid)
+        pipe = self.client.pipeline()
+        if previous is not None and previous != username:
+            pipe.srem(self.user_key(previous), sid)
+        pipe.hset(self.sid_key, sid, username)
+        pipe.sadd(self.user_key(username), sid)
+        self._seen(pipe, sid, username, now)
+        pipe.execute()
+        self._maybe_sweep(now)
+
+    def touch(self, sid):
+        now = time.time()
+        username = self.client.hget(self.sid_key, sid)
+        if username is not None:
+            pipe = self.client.pipeline()
+            self._seen(pipe, sid, username, now)
+            pipe.execute()
+        self._maybe_sweep(now)
+        return username is not None
+
+    def remove(self, sid):
+        username = self.client.hget(self.sid_key, sid)
+        pipe = self.client.pipeline()
+        pipe.hdel(self.sid_key, sid)
+        pipe.zrem(self.sid_seen_key, sid)
+        if username is not None:
+            pipe.srem(self.user_key(username), sid)
+            pipe.zadd(self.last_seen_key, {username: time.time()})
+        pipe.execute()
+        return username
+
+    def sids(self, username):
+        return set(self.client.smembers(self.user_key(username)))
+
+    def online(self, usernames):
+        usernames = list(usernames)
+        pipe = self.client.pipeline()
+        for username in usernames:
+            pipe.scard(self.user_key(username))
+        return {username for username, count in zip(usernames, pipe.execute()) if count}
+
+    def last_seen(self, usernames):
+        usernames = list(usernames)
+        if not usernames:
+            return {}
+        scores = self.client.zmscore(self.last_seen_key, usernames)
+        return {u: score for u, score in zip(usernames, scores) if score is not None}
+
+    def evict_idle(self, now=None):
+        cutoff = (now or time.time()) - self.idle_timeout
+        idle = self.client.zrangebyscore(self.sid_seen_key, "-inf", cutoff)
+        for sid in idle:
+            # not remove(): the sid was last seen at its score, not now
+            username = self.client.hget(self.sid_key, sid)
+            pipe = self.client.pipeline()
+            pipe.hdel(self.sid_key, sid)
+            pipe.zrem(self.sid_seen_key, sid)
+            if username is not None:
+                pipe.srem(self.user_key(username), sid)
+            pipe.execute()
+        # keep the max_users most recently seen users
+        self.client.zremrangebyrank(self.last_seen_key, 0, -self.max_users - 1)
+        return len(idle)
+
+    def _seen(self, pipe, sid, username, now):
+        pipe.zadd(self.sid_seen_key, {sid: now})
+        pipe.zadd(self.last_seen_key, {username: now})
+
+
+def make_presence_registry(url=None, **options):
+    """
+    MemoryPresence when url is empty or "memory", RedisPresence for a
+    redis://, rediss:// or unix:// url. options (idle_timeout, max_users)
+    are passed on.
+    """
+    if not url or url == "memory":
+        return MemoryPresence(**options)
+    if url.startswith(("redis://", "rediss://", "unix://")):
+        return RedisPresence(url, **options)
+    raise ValueError(f"Unknown presence backend {url!r}")
+
+
+_presence = None
+
+
+def init_presence(app):
+    global _presence
+    _presence = make_presence_registry(
+        app.config.get("PRESENCE_URL"),
+        idle_timeout=app.config.get("PRESENCE_IDLE_TIMEOUT", DEFAULT_IDLE_TIMEOUT),
+        max_users=app.config.get("PRESENCE_MAX_USERS", DEFAULT_MAX_USERS),
+    )
+    print(f"Presence registry: {type(_presence).__name__}")
+
+
+def get_presence():
+    global _presence
+    if _presence is None:
+        _presence = MemoryPresence()
+    return _presence
@@ -2,4 +2,4 @@ from flask_sqlalchemy import SQLAlchemy
 from flask_socketio import SocketIO
 
 db = SQLAlchemy()
-#socketio = SocketIO(cors_allowed_origins="*")  # Enable CORS for WebSockets
+socketio = SocketIO(cors_allowed_origins="*")  # Enable CORS for WebSockets
@@ -0,0 +1,15 @@
+import pytest
+from games.answer_prefilter import prefilter
+
+
+@pytest.mark.parametrize("answer", ["Moby Dick", "Pussy willow", "Cock-a-leekie", "Bastard sword", "Dickens"])
+def test_everyday_words_are_not_rejected_as_profanity(answer):
+    tier, verdict = prefilter(answer)
+    assert tier != "profanity"
+    assert verdict is None
+
+
+def test_profanity_is_rejected():
+    tier, verdict = prefilter("fuck off")
+    assert tier == "profanity"
+    assert verdict["correct"] is False
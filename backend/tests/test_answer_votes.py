@@ -0,0 +1,89 @@
+import threading
+import pytest
+import games.answer_checker as answer_checker
+from benchmarks.bench_utils import make_bench_app
+from setup.extensions import db
+from models import User, Game, Player, Answer
+
+
+@pytest.fixture
+def app(tmp_path):
+    # A file database, so two requests really use two connections
+    app = make_bench_app(f"sqlite:///{tmp_path / 'votes.db'}")
+    with app.app_context():
+        for username in ("alice", "bob", "carol"):
+            db.session.add(User(username=username, email=username, password="x", role=1))
+        db.session.add(User(username="admin", email="admin", password="x", role=0))
+        game = Game(room="votes", game_type="WordBlitzOnline")
+        db.session.add(game)
+        db.session.flush()
+        db.session.add(Player(username="alice", game_id=game.id, score=0))
+        alice = User.query.filter_by(username="alice").first()
+        db.session.add(Answer(game_id=game.id, user_id=alice.id, answer_text="Lynx", ai_correct=False))
+        db.session.commit()
+    yield app
+    with app.app_context():
+        db.session.remove()
+        db.engine.dispose()
+
+
+def alice_score(app):
+    with app.app_context():
+        return Player.query.filter_by(username="alice").first().score
+
+
+def run_between_read_and_write(monkeypatch, request):
+    """
+    Runs `request` in a second thread the first time an answer's
+    correctness is read, i.e. right where a concurrent request would land
+    between reading the pre-change state and writing the change.
+    """
+    original = answer_checker.answer_is_correct
+    state = {"started": False}
+
+    def interleaved(answer):
+        if not state["started"]:
+            state["started"] = True
+            other = threading.Thread(target=request)
+            other.start()
+            other.join(timeout=1)  # with the lock held it has to wait for us
+            state["thread"] = other
+        return original(answer)
+
+    monkeypatch.setattr(answer_checker, "answer_is_correct", interleaved)
+    return state
+
+
+def test_interleaved_votes_score_an_answer_once(app, monkeypatch):
+    client = app.test_client()
+    assert client.post("/answer_checker/request_vote", json={"answer_id": 1, "username": "alice"}).status_code == 200
+    assert alice_score(app) == 0
+
+    replies = []
+    state = run_between_read_and_write(monkeypatch, lambda: replies.append(
+        app.test_client().post("/answer_checker/cast_vote", json={"answer_id": 1, "username": "carol", "vote": "yes"})
+    ))
+    replies.append(client.post("/answer_checker/cast_vote", json={"answer_id": 1, "username": "bob", "vote": "yes"}))
+    state["thread"].join()
+
+    assert [r.status_code for r in replies] == [200, 200]
+    assert alice_score(app) == answer_checker.ANSWER_POINTS
+    with app.app_context():
+        assert answer_checker.recalc_scores(1, dry_run=True) == {}
+
+
+def test_override_during_vote_scores_once(app, monkeypatch):
+    client = app.test_client()
+    client.post("/answer_checker/request_vote", json={"answer_id": 1, "username": "alice"})
+
+    replies = []
+    state = run_between_read_and_write(monkeypatch, lambda: replies.append(
+        app.test_client().post("/answer_checker/override", json={"answer_id": 1, "username": "admin", "override_value": True})
+    ))
+    replies.append(client.post("/answer_checker/cast_vote", json={"answer_id": 1, "username": "bob", "vote": "yes"}))
+    state["thread"].join()
+
+    assert [r.status_code for r in replies] == [200, 200]
+    assert alice_score(app) == answer_checker.ANSWER_POINTS
+    with app.app_context():
+        assert answer_checker.recalc_scores(1, dry_run=True) == {}
@@ -0,0 +1,40 @@
+import time
+from utils.lru import LRUCache
+
+
+def test_least_recently_used_is_evicted():
+    cache = LRUCache(2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")
+    cache.put("c", 3)
+    assert cache.get("b") is None
+    assert (cache.get("a"), cache.get("c")) == (1, 3)
+
+
+def test_peek_keeps_eviction_order():
+    cache = LRUCache(2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.peek("a") == 1
+    cache.put("c", 3)
+    assert cache.get("a") is None
+
+
+def test_entries_expire_after_ttl(monkeypatch):
+    now = time.time()
+    cache = LRUCache(ttl=10)
+    cache.put("a", 1)
+    cache.put("b", 2, ttl=100)
+    monkeypatch.setattr(time, "time", lambda: now + 50)
+    assert cache.get("a") is None
+    assert cache.get("b") == 2
+    assert cache.setdefault("a", 3) == 3
+
+
+def test_discard_where():
+    cache = LRUCache()
+    for key, value in (("a", 1), ("b", 2), ("c", 3)):
+        cache.put(key, value)
+    assert cache.discard_where(lambda key, value: value % 2) == 2
+    assert cache.oldest() == ("b", 2)
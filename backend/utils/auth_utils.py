@@ -19,4 +19,26 @@ def get_user_from_req(req: Request) -> User:
 def get_user_from_token(token: str) -> User:
     decoded_token = jwt.decode(token, current_app.config['SECRET_KEY'], algorithms=['HS256'])
     user = User.query.get(decoded_token['user_id'])
-    return user
\ No newline at end of file
+    return user
+
+def get_user_id_from_req(req: Request):
+    """
+    Returns:
+        The id of the user that sent the request, straight from the token
+        (no database lookup), or None when the request has no token or the
+        token is malformed, expired or invalid.
+    """
+    token_bearer_str = req.headers.get("Authorization")
+
+    if not token_bearer_str:
+        return None
+
+    parts = token_bearer_str.split(" ")
+    if len(parts) != 2 or not parts[1]:
+        return None
+
+    try:
+        decoded_token = jwt.decode(parts[1], current_app.config['SECRET_KEY'], algorithms=['HS256'])
+    except jwt.PyJWTError:
+        return None
+    return decoded_token.get('user_id')
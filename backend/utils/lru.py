@@ -0,0 +1,101 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+class LRUCache:
+    """
+    Thread-safe per-process map holding at most max_size entries (None for
+    no bound), least recently used evicted first. With a ttl (seconds, set
+    for the cache or per put), an entry expires that long after it was put
+    and reads as missing from then on.
+    """
+
+    def __init__(self, max_size=None, ttl=None):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries = OrderedDict()  # key -> (expires_at or None, value)
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        """
+        The key's value, marking it as recently used, or default.
+        """
+        with self._lock:
+            entry = self._live(key)
+            if entry is None:
+                return default
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def peek(self, key, default=None):
+        """
+        Like get(), but leaves the key's place in the eviction order alone.
+        """
+        with self._lock:
+            entry = self._live(key)
+            return default if entry is None else entry[1]
+
+    def put(self, key, value, ttl=None):
+        with self._lock:
+            self._store(key, value, ttl)
+        return value
+
+    def setdefault(self, key, value, ttl=None):
+        """
+        Keeps and returns the key's current value if it has one, else puts value.
+        """
+        with self._lock:
+            entry = self._live(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                return entry[1]
+            self._store(key, value, ttl)
+            return value
+
+    def pop(self, key, default=None):
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            return default if entry is None else entry[1]
+
+    def oldest(self):
+        """
+        (key, value) of the least recently used entry, or None when empty.
+        """
+        with self._lock:
+            for key, (_, value) in self._entries.items():
+                return key, value
+            return None
+
+    def discard_where(self, predicate):
+        """
+        Removes every entry for which predicate(key, value) is true.
+        Returns the number removed.
+        """
+        with self._lock:
+            stale = [key for key, (_, value) in self._entries.items() if predicate(key, value)]
+            for key in stale:
+                del self._entries[key]
+            return len(stale)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _live(self, key):
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] is not None and entry[0] <= time.time():
+            del self._entries[key]
+            return None
+        return entry
+
+    def _store(self, key, value, ttl):
+        ttl = self.ttl if ttl is None else ttl
+        self._entries[key] = (None if ttl is None else time.time() + ttl, value)
+        self._entries.move_to_end(key)
+        if self.max_size is not None:
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
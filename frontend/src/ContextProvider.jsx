@@ -14,6 +14,12 @@ export const ContextProvider = ({ children }) => {
         const [socket, setSocket] = useState(null);
         const getFocusedChat = () => chats.find(chat => chat.chat_id == focusedChatId);
         const [totalUnreadMessages, setTotalUnreadMessages] = useState(0);
+        // Loaded history per chat, newest message first: { [chatId]: { messages, hasMore } }
+        const [chatMessages, setChatMessages] = useState({});
+        const focusedChatIdRef = useRef(null);
+        const chatMessagesRef = useRef({});
+        const chatsRef = useRef([]);
+        const getFocusedChatMessages = () => chatMessages[focusedChatId] || { messages: [], hasMore: false };
 
         const newMessageSound = new Audio("/message-sound-low-vol.mp3");
         newMessageSound.volume = 0.7;
@@ -36,8 +42,15 @@ export const ContextProvider = ({ children }) => {
             newSocket.on("joined_chat_rooms", (data) => {
               console.log("Joined rooms:", data.rooms);
             });
+
+            // Keeps this connection in the server's presence registry
+            newSocket.on("presence_expired", () => {
+              newSocket.emit("join_chat_rooms", { token: LocalStorageUtils.getToken() });
+            });
+            const presencePing = setInterval(() => newSocket.emit("presence_ping"), 60000);
     
             return () => {
+              clearInterval(presencePing);
               newSocket.disconnect();
             };
         }, []);
@@ -46,20 +59,57 @@ export const ContextProvider = ({ children }) => {
             if (socket) {
                 socket.on("chat_created", (data) => {
                     console.log("Chat Created:", data);
-                    setChats(data.chat_details);
+                    setChats(prev => [...prev.filter(chat => chat.chat_id != data.new_chat.chat_id), data.new_chat]);
                     setFocusedChatId(data.new_chat.chat_id)
                     setIsChatMenuOpen(true);
                 });
         
+                // Only the new message and unread counts arrive, patch the inbox and history with them
                 socket.on("message_created", (data) => {
-                    if(data.new_message_details.username != LocalStorageUtils.getUsername()){
+                    const { chat_id, message, unread_counts } = data;
+                    const username = LocalStorageUtils.getUsername();
+                    if(message.username != username){
                         newMessageSound.play();
                     }
-                    fetchChats()
+                    if (!chatsRef.current.some(chat => chat.chat_id == chat_id)) {
+                        fetchChats()
+                    } else {
+                        setChats(prev => prev.map(chat => chat.chat_id == chat_id
+                            ? { ...chat, last_message: message, unread_message_count: unread_counts[username] ?? chat.unread_message_count }
+                            : chat
+                        ));
+                    }
+                    setChatMessages(prev => {
+                        const current = prev[chat_id];
+                        if (!current || current.messages.some(m => m.message_id >= message.message_id)) {
+                            return prev;
+                        }
+                        return { ...prev, [chat_id]: { ...current, messages: [message, ...current.messages] } };
+                    });
                 })
+
+                return () => {
+                    socket.off("chat_created");
+                    socket.off("message_created");
+                };
             }
         }, [socket, focusedChatId])
 
+        useEffect(() => {
+            chatMessagesRef.current = chatMessages;
+        }, [chatMessages])
+
+        useEffect(() => {
+            chatsRef.current = chats;
+        }, [chats])
+
+        useEffect(() => {
+            focusedChatIdRef.current = focusedChatId;
+            if (focusedChatId) {
+                fetchNewerMessages(focusedChatId);
+            }
+        }, [focusedChatId])
+
 
         const createChat = (recipientUsername) => {
             if (socket) {
@@ -100,6 +150,65 @@ export const ContextProvider = ({ children }) => {
 
         };
 
+        const fetchMessages = async (chatId, cursor = "") => {
+            const response = await fetch(`${API_URL}/chat/messages?chat_id=${chatId}${cursor}`, {
+                method: "GET",
+                headers: {
+                    "Content-Type": "application/json",
+                    "Authorization": `Bearer ${LocalStorageUtils.getToken()}`
+                }
+            });
+            if (!response.ok) {
+                console.log("Error getting messages")
+                return null;
+            }
+            return response.json();
+        };
+
+        // Newest page the first time a chat is opened, afterwards only what came in since
+        const fetchNewerMessages = async (chatId) => {
+            try {
+                const loaded = chatMessagesRef.current[chatId];
+                const newestId = loaded?.messages[0]?.message_id;
+                const data = await fetchMessages(chatId, newestId ? `&after=${newestId}` : "");
+                if (!data) return;
+                setChatMessages(prev => {
+                    const current = prev[chatId];
+                    if (!current || !newestId) {
+                        return { ...prev, [chatId]: { messages: data.messages, hasMore: data.has_more } };
+                    }
+                    if (data.has_more) {
+                        // Too much came in to stitch together, start again from the newest page
+                        fetchMessages(chatId).then(fresh => fresh && setChatMessages(p => (
+                            { ...p, [chatId]: { messages: fresh.messages, hasMore: fresh.has_more } }
+                        )));
+                        return prev;
+                    }
+                    const currentNewest = current.messages[0]?.message_id || 0;
+                    const incoming = data.messages.filter(m => m.message_id > currentNewest);
+                    return { ...prev, [chatId]: { ...current, messages: [...incoming, ...current.messages] } };
+                });
+            } catch (error) {
+                console.error(error);
+            }
+        };
+
+        const fetchOlderMessages = async (chatId) => {
+            try {
+                const loaded = chatMessagesRef.current[chatId];
+                const oldestId = loaded?.messages[loaded.messages.length - 1]?.message_id;
+                if (!oldestId) return;
+                const data = await fetchMessages(chatId, `&before=${oldestId}`);
+                if (!data) return;
+                setChatMessages(prev => ({
+                    ...prev,
+                    [chatId]: { messages: [...prev[chatId].messages, ...data.messages], hasMore: data.has_more }
+                }));
+            } catch (error) {
+                console.error(error);
+            }
+        };
+
         const readChat = async (chatId) => {
         try {
             const response = await fetch(`${API_URL}/chat/mark-chat-read`, {
@@ -159,6 +268,8 @@ export const ContextProvider = ({ children }) => {
             createMessage,
             fetchChats, 
             getFocusedChat,
+            getFocusedChatMessages,
+            fetchOlderMessages,
             totalUnreadMessages, setTotalUnreadMessages,
             readChat
          }}>
@@ -168,3 +279,35 @@ export const ContextProvider = ({ children }) => {
 };
 
 export const useAppContext = () => useContext(AppContext);
+
+// Joins a game's socket room while `room` is set and calls handlers[event]
+// for that room's events, e.g. useGameRoom(room, { game_ended: onEnded }).
+// The server only lets players of the game in. Rejoins after a reconnect.
+export const useGameRoom = (room, handlers) => {
+    const { socket } = useAppContext();
+    const handlersRef = useRef(handlers);
+    handlersRef.current = handlers;
+
+    useEffect(() => {
+        if (!socket || !room) return;
+        const join = () => socket.emit("join_game", { room, token: LocalStorageUtils.getToken() });
+        join();
+        socket.on("connect", join);
+
+        const listeners = Object.keys(handlersRef.current).map((event) => {
+            const listener = (data) => {
+                if (data && data.room && data.room !== room) return;
+                const handler = handlersRef.current[event];
+                if (handler) handler(data);
+            };
+            socket.on(event, listener);
+            return [event, listener];
+        });
+
+        return () => {
+            socket.off("connect", join);
+            listeners.forEach(([event, listener]) => socket.off(event, listener));
+            socket.emit("leave_game", { room });
+        };
+    }, [socket, room]);
+};
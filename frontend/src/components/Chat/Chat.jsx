@@ -15,6 +15,8 @@ const Chat = () => {
         createMessage,
         fetchChats, 
         getFocusedChat,
+        getFocusedChatMessages,
+        fetchOlderMessages,
         totalUnreadMessages,
         readChat
     } = useAppContext();
@@ -95,7 +97,7 @@ const Chat = () => {
                         )}
                       </div>
                       <div className='username'>{chat.username}</div>
-                      <div className='last-message'>  {chat.messages[0]?.message_body.slice(0, 12)}{chat.messages[0]?.message_body.length > 15 ? " . . . " : null}
+                      <div className='last-message'>  {chat.last_message?.message_body.slice(0, 12)}{chat.last_message?.message_body.length > 15 ? " . . . " : null}
 
                       </div>
                     </div>
@@ -116,8 +118,8 @@ const Chat = () => {
                 <box-icon className="back-btn" name="arrow-back" onClick={() => setFocusedChatId(null)}></box-icon>
                 <h6>{getFocusedChat().username}</h6>
                 <div className='messages-div'>
-                    {getFocusedChat().messages && getFocusedChat().messages.length > 0 ? (
-                    getFocusedChat().messages.map((message) => (
+                    {getFocusedChatMessages().messages.length > 0 ? (
+                    getFocusedChatMessages().messages.map((message) => (
                         <div className={'chat-message-div ' + (message.username == LocalStorageUtils.getUsername() ? 'you-message' : 'them-message')} key={message.message_id}>
                             <span>{message.username} </span>
                             <p>{message.message_body}</p>
@@ -126,6 +128,9 @@ const Chat = () => {
                     ) : (
                     <span>There are no messages yet.</span>
                     )}
+                    {getFocusedChatMessages().hasMore && (
+                      <button type="button" className='load-older-btn' onClick={() => fetchOlderMessages(focusedChatId)}>Load older messages</button>
+                    )}
                 </div>
                 <form onSubmit={handleMessageSubmit}>
                     <input value={inputtedMessage} onChange={(e) => setInputtedMessage(e.target.value)} type="text" name="message_body" autocomplete="off" required/>
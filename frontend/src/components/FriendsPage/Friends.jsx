@@ -14,13 +14,41 @@ const Friends = () => {
   const [friendUsername, setFriendUsername] = useState("");
   const [friendMessage, setFriendMessage] = useState("");
   const [friends, setFriends] = useState([]);
+  const [onlineFriends, setOnlineFriends] = useState({ online: [], last_seen: {} });
   const [selectedProfile, setSelectedProfile] = useState(null);
   const [isModalOpen, setIsModalOpen] = useState(false);
 
   useEffect(() => {
     fetchFriends();
+    fetchOnlineFriends();
+    const interval = setInterval(fetchOnlineFriends, 30000);
+    return () => clearInterval(interval);
   }, []);
 
+  const fetchOnlineFriends = async () => {
+    try {
+      const response = await fetch(`${API_URL}/friends/online`, {
+        method: "GET",
+        headers: {
+          "Content-Type": "application/json",
+          "Authorization": `Bearer ${token}`
+        }
+      });
+      if (response.ok) {
+        const data = await response.json();
+        setOnlineFriends({ online: data.online || [], last_seen: data.last_seen || {} });
+      }
+    } catch (error) {
+      console.error("Error fetching online friends:", error);
+    }
+  };
+
+  const friendStatus = (friend) => {
+    if (onlineFriends.online.includes(friend)) return "🟢 Online";
+    const lastSeen = onlineFriends.last_seen[friend];
+    return lastSeen ? `⚪ Last seen ${new Date(lastSeen * 1000).toLocaleString()}` : "⚪ Offline";
+  };
+
   const fetchFriends = async () => {
     try {
       const response = await fetch(`${API_URL}/friends/get-all`, {
@@ -65,6 +93,7 @@ const Friends = () => {
       if (response.ok) {
         setFriendMessage(`✅ ${friendUsername} has been ${action}ed successfully!`);
         fetchFriends();
+        fetchOnlineFriends();
       } else {
         setFriendMessage(`❌ ${data.message || "Failed to update friend list"}`);
       }
@@ -155,6 +184,7 @@ const Friends = () => {
               {friends.map((friend, index) => (
                 <li key={index} className="friend-item">
                   <span className="friend-username">✨ {friend}</span>
+                  <span className="friend-status">{friendStatus(friend)}</span>
                   <div className="friend-actions">
                     <button 
                       className="friend-action-btn chat-btn"
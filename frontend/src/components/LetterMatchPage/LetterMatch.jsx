@@ -4,6 +4,8 @@ import Layout from "../Layout/Layout";
 
 // Import the PostGameChecker component
 import PostGameChecker from "../PostGameChecker/PostGameChecker";
+import { useGameRoom } from "../../ContextProvider";
+import { FALLBACK_POLL_MS } from "../../config";
 
 const API_URL = "http://localhost:5000";
 const API_BASE_URL = `${API_URL}/letter_match`;
@@ -60,6 +62,9 @@ const LetterMatch = () => {
   //online mode submit >> locks input if user hit submit
   const [hasSubmitted, setHasSubmitted] = useState(false);
 
+  // For online only: when the server's round ends (ISO string, UTC)
+  const [endsAt, setEndsAt] = useState(null);
+
 
   //---------------------------------------------------------------------------
   // 1. On mount, fetch logged-in user (for online)
@@ -112,14 +117,25 @@ const LetterMatch = () => {
 
   
   //---------------------------------------------------------------------------
-  // 3. For ONLINE: poll server for "time_left" etc.
+  // 3. For ONLINE: the game room pushes changes, a slow poll covers missed events
   //---------------------------------------------------------------------------
+  useGameRoom(inRoom && gameType === "LetterMatchOnline" ? room : null, {
+    player_joined: () => fetchGameState(),
+    game_started: () => fetchGameState(),
+    answer_scored: () => fetchGameState(),
+    game_ended: (data) => {
+      setPlayers(data.players || []);
+      setGameOver(true);
+      setStatus("⏰ Time's up! Final scores shown below.");
+    },
+  });
+
   useEffect(() => {
     let pollId;
     if (inRoom && gameType === "LetterMatchOnline" && !gameOver) {
       pollId = setInterval(() => {
         fetchGameState();
-      }, 1000);
+      }, FALLBACK_POLL_MS);
     }
     return () => {
       if (pollId) clearInterval(pollId);
@@ -127,6 +143,21 @@ const LetterMatch = () => {
   }, [inRoom, gameOver, gameType]);
 
   //synchs start time so both online players can start at same time
+  // the countdown runs from the server's ends_at, so polls can stay 304s
+  useEffect(() => {
+    if (gameType !== "LetterMatchOnline" || !endsAt || gameOver) return;
+    const tick = () => {
+      const left = Math.max(Math.round((Date.parse(endsAt) - Date.now()) / 1000), 0);
+      setLocalTimeLeft(left);
+      if (left === 0) {
+        setGameOver(true);
+        setStatus("⏰ Time's up! Final scores shown below.");
+      }
+    };
+    tick();
+    const tickId = setInterval(tick, 1000);
+    return () => clearInterval(tickId);
+  }, [gameType, endsAt, gameOver]);
 
 
 
@@ -163,12 +194,12 @@ const LetterMatch = () => {
         setAnswers((old) => ({ ...initAns, ...old }));
       }
 
-      // Update time_left (only for online game mode)
+      // Countdown (only for online game mode) runs from ends_at, see above
       if (gameType === "LetterMatchOnline") {
-        setLocalTimeLeft(data.time_left);
+        setEndsAt(data.ends_at);
       }
   
-      if (data.started && data.time_left === 0) {
+      if (data.started && data.finished) {
         setGameOver(true);
         setStatus("⏰ Time's up! Final scores shown below.");
       }
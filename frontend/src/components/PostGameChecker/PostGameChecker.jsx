@@ -1,5 +1,6 @@
 import React, { useState, useEffect } from "react";
 import "./PostGameChecker.css";
+import { useAppContext } from "../../ContextProvider";
 
 const PostGameChecker = ({ visible, onClose, gameId, isAdmin, onScoresChanged }) => {
   const [answersState, setAnswersState] = useState([]);
@@ -7,6 +8,7 @@ const PostGameChecker = ({ visible, onClose, gameId, isAdmin, onScoresChanged })
   const [error, setError] = useState("");
   const [userVotes, setUserVotes] = useState({});
   const [loggedInUser, setLoggedInUser] = useState("");
+  const { socket } = useAppContext();
 
 
 
@@ -39,6 +41,14 @@ const PostGameChecker = ({ visible, onClose, gameId, isAdmin, onScoresChanged })
     fetchAllAnswers();
   }, [visible, gameId]);
 
+  // AI checks run in the background, the game room is told when a verdict lands
+  useEffect(() => {
+    if (!socket || !visible || !gameId) return;
+    const onAnswerChecked = () => fetchAllAnswers();
+    socket.on("answer_checked", onAnswerChecked);
+    return () => socket.off("answer_checked", onAnswerChecked);
+  }, [socket, visible, gameId, loggedInUser]);
+
   const fetchAllAnswers = async () => {
     setLoading(true);
     setError("");
@@ -85,7 +95,8 @@ const PostGameChecker = ({ visible, onClose, gameId, isAdmin, onScoresChanged })
           game_id: gameId,
           question_id: row.questionId,
           username: row.username,
-          answer_text: row.word
+          answer_text: row.word,
+          async: true
         }),
       });
       const data = await resp.json();
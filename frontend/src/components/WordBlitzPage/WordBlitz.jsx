@@ -4,6 +4,8 @@ import Layout from "../Layout/Layout";
 
 // Import the PostGameChecker component
 import PostGameChecker from "../PostGameChecker/PostGameChecker";
+import { useGameRoom } from "../../ContextProvider";
+import { FALLBACK_POLL_MS } from "../../config";
 
 const API_URL = "http://localhost:5000";
 const API_BASE_URL = `${API_URL}/word_blitz`;
@@ -89,35 +91,48 @@ const WordBlitz = () => {
   }, [gameType, gameStarted, gameOver, currentLocalPlayerIndex]);
 
   //---------------------------------------------------------------------------
-  // 3. For ONLINE: poll server for "time_left" etc.
+  // 3. For ONLINE: the game room pushes changes, a slow poll covers missed events
   //---------------------------------------------------------------------------
+  useGameRoom(inRoom && gameType === "WordBlitzOnline" ? room : null, {
+    player_joined: () => fetchGameState(),
+    game_started: (data) => {
+      setLocalTimeLeft(data.time_limit);
+      fetchGameState();
+    },
+    answer_scored: () => fetchGameState(),
+    timer_tick: (data) => setLocalTimeLeft(data.time_left),
+    game_ended: (data) => {
+      setPlayers(data.players || []);
+      setGameOver(true);
+      setStatus("⏰ Time's up! Game over!");
+    },
+    // post-game checks and votes change scores
+    answer_checked: () => fetchGameState(),
+    answers_checked: () => fetchGameState(),
+    vote_tally: () => fetchGameState(),
+  });
+
   useEffect(() => {
     let pollId;
     if (inRoom && gameType === "WordBlitzOnline" && !gameOver) {
       pollId = setInterval(() => {
         fetchGameState();
-      }, 3000);
+      }, FALLBACK_POLL_MS);
     }
     return () => {
       if (pollId) clearInterval(pollId);
     };
   }, [inRoom, gameOver, gameType]);
   useEffect(() => {
-    if (gameOver) {
-      // Start polling for score updates every 3 seconds
+    // Local games have no socket room: poll for score updates every 3 seconds
+    if (gameOver && gameType !== "WordBlitzOnline") {
       const interval = setInterval(() => {
-        if (gameType === "WordBlitzOnline") {
-          fetchGameState();
-        } else {
-          reloadPlayersScores();
-        }
+        reloadPlayersScores();
       }, 3000);
       setScoreUpdateInterval(interval);
 
       // Clean up interval on unmount
-      return () => {
-        if (scoreUpdateInterval) clearInterval(scoreUpdateInterval);
-      };
+      return () => clearInterval(interval);
     }
   }, [gameOver]);
   //---------------------------------------------------------------------------
@@ -707,7 +722,9 @@ const WordBlitz = () => {
                 ⏱️ <span className="time-left">{localTimeLeft}</span> seconds left
               </h3>
             ) : (
-              <p className="online-mode-message">🌍 Online mode - waiting for updates...</p>
+              <p className="online-mode-message">
+                🌍 Online mode - ⏱️ <span className="time-left">{localTimeLeft}</span> seconds left
+              </p>
             )}
   
             <h4 className="players-score-title">📊 Players & Scores:</h4>
@@ -1,6 +1,8 @@
 import React, { useState, useEffect, useRef } from "react";
 import "./WordChain.css";
 import Layout from "../Layout/Layout";
+import { useGameRoom } from "../../ContextProvider";
+import { FALLBACK_POLL_MS } from "../../config";
 
 const API_URL = "http://localhost:5000";
 const API_BASE_URL = `${API_URL}/word_chain`;
@@ -23,6 +25,8 @@ const WordChain = () => {
   const [currentTurnIndex, setCurrentTurnIndex] = useState(0);
   const [timeLeft, setTimeLeft] = useState(30);
   const timerRef = useRef(null);
+  // Words already fetched for a room, so polls only ask for newer ones
+  const chainRef = useRef({ room: null, lastSeq: null, words: [] });
 
   useEffect(() => {
     const fetchUser = async () => {
@@ -55,13 +59,25 @@ const WordChain = () => {
 
   const fetchGameState = async (targetRoom) => {
     try {
-      const res = await fetch(`${API_BASE_URL}/get_state?room=${targetRoom}`);
+      const cached = chainRef.current;
+      const incremental = cached.room === targetRoom && cached.lastSeq !== null;
+      const sinceParam = incremental ? `&since_seq=${cached.lastSeq}` : "";
+      const res = await fetch(`${API_BASE_URL}/get_state?room=${targetRoom}${sinceParam}`);
       const data = await res.json();
       if (data.error) {
         setStatus(`❌ ${data.error}`);
       } else {
+        const words = incremental
+          ? [...cached.words, ...(data.wordChain || [])]
+          : data.wordChain || [];
+        if (incremental && data.length !== undefined && words.length !== data.length) {
+          // A word was vetoed since the last poll, reload the whole chain
+          chainRef.current = { room: null, lastSeq: null, words: [] };
+          return fetchGameState(targetRoom);
+        }
+        chainRef.current = { room: targetRoom, lastSeq: data.last_seq ?? null, words };
         setPlayers(data.players || []);
-        setWordChain(data.wordChain || []);
+        setWordChain(words);
         setStatus("State refreshed!");
       }
     } catch (err) {
@@ -76,6 +92,28 @@ const WordChain = () => {
     }
   }, [room]);
 
+  // Online players follow the room's events, a slow poll covers missed ones
+  const onlineRoom =
+    gameMode === "online" && room && loggedInUser && players.includes(loggedInUser) ? room : null;
+  useGameRoom(onlineRoom, {
+    word_added: () => fetchGameState(onlineRoom),
+    word_vetoed: () => fetchGameState(onlineRoom),
+    player_joined: () => fetchGameState(onlineRoom),
+    player_left: () => fetchGameState(onlineRoom),
+    timer_started: (data) => startOnlineCountdown(data.duration),
+    timer_tick: (data) => setTimeLeft(data.time_left),
+    game_ended: () => {
+      stopTimer();
+      setStatus("⏰ Time's up!");
+    },
+  });
+
+  useEffect(() => {
+    if (!onlineRoom) return;
+    const pollId = setInterval(() => fetchGameState(onlineRoom), FALLBACK_POLL_MS);
+    return () => clearInterval(pollId);
+  }, [onlineRoom]);
+
   useEffect(() => {
     if (players.length > 0 && currentUser) {
       // User is admin if they're first player OR have admin role (isAdmin)
@@ -104,6 +142,7 @@ const WordChain = () => {
         setStatus(`✅ ${data.message}`);
         setPlayers([]);
         setWordChain([]);
+        chainRef.current = { room: null, lastSeq: null, words: [] };
         fetchGameState(room);
       }
     } catch (err) {
@@ -325,19 +364,7 @@ const WordChain = () => {
         setStatus(`❌ ${data.error}`);
       } else {
         setStatus(`✅ ${data.message}`);
-        if (timerRef.current) clearInterval(timerRef.current);
-        setTimeLeft(duration);
-
-        const newTimer = setInterval(() => {
-          setTimeLeft((prev) => {
-            if (prev <= 1) {
-              clearInterval(newTimer);
-              return 0;
-            }
-            return prev - 1;
-          });
-        }, 1000);
-        timerRef.current = newTimer;
+        startOnlineCountdown(duration);
       }
     } catch (err) {
       console.error(err);
@@ -345,6 +372,23 @@ const WordChain = () => {
     }
   };
 
+  // Every player's countdown starts from the room's timer_started event
+  const startOnlineCountdown = (duration) => {
+    if (timerRef.current) clearInterval(timerRef.current);
+    setTimeLeft(duration);
+
+    const newTimer = setInterval(() => {
+      setTimeLeft((prev) => {
+        if (prev <= 1) {
+          clearInterval(newTimer);
+          return 0;
+        }
+        return prev - 1;
+      });
+    }, 1000);
+    timerRef.current = newTimer;
+  };
+
   const stopTimer = () => {
     if (timerRef.current) clearInterval(timerRef.current);
     setTimeLeft(0);
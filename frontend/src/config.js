@@ -1 +1,5 @@
-export const API_URL = "http://localhost:5000"
\ No newline at end of file
+export const API_URL = "http://localhost:5000"
+
+// Online games are driven by socket events (see useGameRoom), so game pages
+// only poll this often, as a fallback for a dropped connection
+export const FALLBACK_POLL_MS = 15000;